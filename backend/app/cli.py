@@ -0,0 +1,64 @@
+"""
+Unified `rpgelsewhere` command-line entry point.
+
+Subcommand modules (and their SQLAlchemy/httpx/warcio imports) are only
+imported once a subcommand is chosen, so `rpgelsewhere --help` stays instant.
+
+Usage:
+    uv run rpgelsewhere --help
+    uv run rpgelsewhere scrape-sitemap --dry-run
+    uv run rpgelsewhere scrape-commoncrawl --categories Class Species
+"""
+
+import argparse
+import importlib
+import sys
+
+# Subcommand → (module with a main(argv, prog) function, one-line help)
+COMMANDS: dict[str, tuple[str, str]] = {
+    "scrape-sitemap": (
+        "scripts.scrape_sitemap",
+        "Scrape content URLs from the D&D Beyond sitemap",
+    ),
+    "scrape-commoncrawl": (
+        "scripts.scrape_commoncrawl",
+        "Scrape content URLs and editions from Common Crawl",
+    ),
+    "merge": (
+        "scripts.merge_entries",
+        "Merge staged scraper output into entries",
+    ),
+    "check-links": (
+        "scripts.check_links",
+        "Check that entry URLs still resolve",
+    ),
+    "export": (
+        "scripts.export_entries",
+        "Export DB entries + CSV overrides to entries.json",
+    ),
+    "evaluate-completeness": (
+        "scripts.evaluate_completeness",
+        "Evaluate dataset completeness against the 5e SRD",
+    ),
+}
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+
+    parser = argparse.ArgumentParser(
+        prog="rpgelsewhere", description="RPGElsewhere build-time tooling"
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+    for name, (_, help_text) in COMMANDS.items():
+        # Subcommand options (including --help) are parsed by the module itself
+        subparsers.add_parser(name, help=help_text, add_help=False)
+
+    args = parser.parse_args(argv[:1])
+    module_name, _ = COMMANDS[args.command]
+    module = importlib.import_module(module_name)
+    module.main(argv[1:], prog=f"rpgelsewhere {args.command}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+from functools import cache
 from pathlib import Path
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -16,4 +17,7 @@ class Settings(BaseSettings):
     )
 
 
-settings = Settings()
+@cache
+def get_settings() -> Settings:
+    """Load settings on first use rather than as an import side effect."""
+    return Settings()
@@ -1,17 +1,46 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from functools import cache
 
-from app.config import settings
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
-_is_sqlite = settings.database_url.startswith("sqlite")
-_connect_args = {"check_same_thread": False} if _is_sqlite else {}
-engine = create_engine(settings.database_url, connect_args=_connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from app.config import get_settings
+
+SQLITE_BUSY_TIMEOUT_MS = 30_000
 
 
 class Base(DeclarativeBase):
     pass
 
 
+@cache
+def get_engine() -> Engine:
+    """Create the engine on first use so importing models doesn't touch the DB."""
+    database_url = get_settings().database_url
+    is_sqlite = database_url.startswith("sqlite")
+    connect_args = {"check_same_thread": False} if is_sqlite else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+    if is_sqlite:
+        event.listen(engine, "connect", _configure_sqlite)
+    return engine
+
+
+def _configure_sqlite(dbapi_connection, connection_record) -> None:
+    # WAL lets readers (and a second scraper process) proceed while one
+    # connection writes; busy_timeout makes competing writers wait, not fail
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+
+@cache
+def _session_factory() -> sessionmaker[Session]:
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
+
+def get_session() -> Session:
+    return _session_factory()()
+
+
 def create_tables() -> None:
-    Base.metadata.create_all(engine)
+    Base.metadata.create_all(get_engine())
@@ -0,0 +1,194 @@
+"""
+Shared HTTP client setup for all scrapers.
+
+Every script gets its client from `create_client` so connection pooling,
+keep-alive, compression, timeouts, retries and metrics are configured in one
+place. HTTP/2 and brotli are used when their optional packages are installed.
+Request pacing for worker threads that share a client lives here as well.
+"""
+
+import importlib.util
+import threading
+import time
+from collections import Counter
+
+import httpx
+
+USER_AGENT = "rpgelsewhere/0.1 (+https://github.com/kkuchta/rpgelsewhere)"
+
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+# Statuses worth retrying: rate limiting and transient server/gateway errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_METHODS = frozenset({"GET", "HEAD"})
+MAX_RETRY_AFTER = 60.0
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+BROTLI_AVAILABLE = (
+    importlib.util.find_spec("brotli") is not None
+    or importlib.util.find_spec("brotlicffi") is not None
+)
+ACCEPT_ENCODING = "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"
+
+
+class HttpMetrics:
+    """Thread-safe request/response counters, filled in by client event hooks."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.statuses: Counter[int] = Counter()
+        self.http_versions: Counter[str] = Counter()
+
+    def on_request(self, request: httpx.Request) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def on_response(self, response: httpx.Response) -> None:
+        with self._lock:
+            self.statuses[response.status_code] += 1
+            self.http_versions[response.http_version] += 1
+
+    def on_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def summary(self) -> str:
+        with self._lock:
+            statuses = ", ".join(f"{k}×{v}" for k, v in sorted(self.statuses.items()))
+            versions = ", ".join(f"{k}×{v}" for k, v in self.http_versions.items())
+            return (
+                f"{self.requests} requests ({self.retries} retries); "
+                f"statuses: {statuses or 'none'}; protocols: {versions or 'none'}"
+            )
+
+
+class RateLimiter:
+    """Space out request starts so at most one begins every `interval` seconds.
+
+    Shared between worker threads, so parallel requests overlap their (often
+    slow) server-side work while staying within the polite request rate.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class HostRateLimiter:
+    """A `RateLimiter` per host, so one slow origin doesn't throttle the rest."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._limiters: dict[str, RateLimiter] = {}
+
+    def wait(self, url: str) -> None:
+        host = httpx.URL(url).host
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = self._limiters[host] = RateLimiter(self.interval)
+        limiter.wait()
+
+
+class RetryTransport(httpx.BaseTransport):
+    """Retry idempotent requests on transport errors and retryable statuses.
+
+    Backs off exponentially, honouring a numeric `Retry-After` header when the
+    server sends one.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        retries: int = 3,
+        backoff: float = 1.0,
+        metrics: HttpMetrics | None = None,
+    ):
+        self.transport = transport
+        self.retries = retries
+        self.backoff = backoff
+        self.metrics = metrics
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method not in RETRY_METHODS:
+            return self.transport.handle_request(request)
+
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            try:
+                response = self.transport.handle_request(request)
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+                delay = self.backoff * 2**attempt
+            else:
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    return response
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self.backoff * 2**attempt
+                response.close()
+            if self.metrics is not None:
+                self.metrics.on_retry()
+            time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> float | None:
+        try:
+            return min(float(response.headers["Retry-After"]), MAX_RETRY_AFTER)
+        except (KeyError, ValueError):
+            return None
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+def create_client(
+    *,
+    max_connections: int = 10,
+    timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+    retries: int = 3,
+    metrics: HttpMetrics | None = None,
+    transport: httpx.BaseTransport | None = None,
+) -> httpx.Client:
+    """Build a pooled keep-alive client with the project's standard settings.
+
+    httpx keeps a separate connection pool per origin; `max_connections` caps
+    the total, and every pooled connection is kept alive for reuse. Pass
+    `transport` to layer in caching or to substitute a mock in tests — it is
+    wrapped with retry handling either way.
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=30.0,
+    )
+    if transport is None:
+        transport = httpx.HTTPTransport(http2=HTTP2_AVAILABLE, limits=limits)
+
+    event_hooks = {}
+    if metrics is not None:
+        event_hooks = {
+            "request": [metrics.on_request],
+            "response": [metrics.on_response],
+        }
+
+    return httpx.Client(
+        transport=RetryTransport(transport, retries=retries, metrics=metrics),
+        timeout=timeout,
+        headers={"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING},
+        event_hooks=event_hooks,
+    )
@@ -0,0 +1,106 @@
+"""
+Durable progress journal for long Common Crawl runs.
+
+Finished CDX page queries and classified WARC results are written to
+checkpoint tables in the same SQLite database as they complete, so an
+interrupted scrape can pick up where it stopped with `--resume`.
+"""
+
+import json
+import time
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.models import CdxPageCheckpoint, WarcCheckpoint
+
+# WARC results are buffered and committed at most this many seconds apart,
+# bounding how much work a crash can lose
+FLUSH_INTERVAL = 2.0
+
+
+class CrawlJournal:
+    def __init__(self, db: Session, flush_interval: float = FLUSH_INTERVAL):
+        self.db = db
+        self.flush_interval = flush_interval
+        self._pending_warc: list[dict] = []
+        self._last_flush = time.monotonic()
+
+    def reset(self) -> None:
+        """Discard checkpoints from any previous run."""
+        self.db.execute(delete(CdxPageCheckpoint))
+        self.db.execute(delete(WarcCheckpoint))
+        self.db.commit()
+
+    def completed_pages(self) -> list[tuple[str, str, int, int, list[dict]]]:
+        """Return (crawl_id, prefix, page, num_pages, records) for finished pages."""
+        rows = self.db.scalars(select(CdxPageCheckpoint)).all()
+        return [
+            (row.crawl_id, row.prefix, row.page, row.num_pages, json.loads(row.records))
+            for row in rows
+        ]
+
+    def record_page(
+        self, crawl_id: str, prefix: str, page: int, num_pages: int, records: list[dict]
+    ) -> None:
+        """Commit a finished CDX page immediately — each one is a slow query."""
+        values = {
+            "crawl_id": crawl_id,
+            "prefix": prefix,
+            "page": page,
+            "num_pages": num_pages,
+            "records": json.dumps(records, separators=(",", ":")),
+        }
+        stmt = insert(CdxPageCheckpoint).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["crawl_id", "prefix", "page"],
+            set_={
+                "num_pages": stmt.excluded.num_pages,
+                "records": stmt.excluded.records,
+            },
+        )
+        self.db.execute(stmt)
+        self.db.commit()
+
+    def warc_results(self) -> dict[str, WarcCheckpoint]:
+        rows = self.db.scalars(select(WarcCheckpoint)).all()
+        return {row.url: row for row in rows}
+
+    def record_warc(
+        self,
+        url: str,
+        timestamp: str,
+        name: str | None,
+        edition: str | None,
+        is_homebrew: bool,
+    ) -> None:
+        self._pending_warc.append(
+            {
+                "url": url,
+                "timestamp": timestamp,
+                "name": name,
+                "edition": edition,
+                "is_homebrew": is_homebrew,
+            }
+        )
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Commit any buffered WARC results."""
+        if self._pending_warc:
+            stmt = insert(WarcCheckpoint).values(self._pending_warc)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["url"],
+                set_={
+                    "timestamp": stmt.excluded.timestamp,
+                    "name": stmt.excluded.name,
+                    "edition": stmt.excluded.edition,
+                    "is_homebrew": stmt.excluded.is_homebrew,
+                },
+            )
+            self.db.execute(stmt)
+            self.db.commit()
+            self._pending_warc = []
+        self._last_flush = time.monotonic()
@@ -0,0 +1,27 @@
+"""
+Normalisation of sitemap <lastmod> values.
+
+<lastmod> is a W3C datetime: a bare date, or a date and time with optional
+seconds, fractional seconds and timezone. Both scrapers compare it as a UTC
+YYYYMMDDhhmmss string, the same fixed-width form as CDX capture timestamps.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+
+def lastmod_timestamp(lastmod: str) -> str | None:
+    """Return a <lastmod> as a UTC YYYYMMDDhhmmss string, or None if unparseable.
+
+    A bare date (or a time without a timezone) is taken as UTC. Fractional
+    seconds round up, so a capture in the same second as the change counts as
+    older than it.
+    """
+    try:
+        parsed = datetime.fromisoformat(lastmod.strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    if parsed.microsecond:
+        parsed = parsed.replace(microsecond=0) + timedelta(seconds=1)
+    return parsed.astimezone(UTC).strftime("%Y%m%d%H%M%S")
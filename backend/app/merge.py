@@ -0,0 +1,61 @@
+"""
+Set-based merge of per-source staging tables into the final entries table.
+
+Each scraper only loads its own staging table; this module owns every
+conflict-resolution rule, so the result no longer depends on which scraper
+ran last. Precedence, per column:
+
+    name      Common Crawl page title → sitemap slug → Common Crawl slug
+    category  sitemap → Common Crawl
+    edition   Common Crawl → the edition already in entries
+
+The sitemap wins on category because its class/subclass split is curated.
+Edition only ever comes from Common Crawl WARC records; keeping the existing
+value when no record has been classified yet stops a URL's edition from
+flapping to NULL.
+"""
+
+from sqlalchemy import func, or_, select, true, union
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.models import CommonCrawlStaging, Entry, SitemapStaging
+
+
+def merge_staged_entries(db: Session) -> int:
+    """Upsert the merged staging rows into entries; return rows changed."""
+    s, c = SitemapStaging, CommonCrawlStaging
+    urls = union(select(s.url), select(c.url)).subquery()
+    merged = (
+        select(
+            func.coalesce(c.title_name, s.name, c.name),
+            func.coalesce(s.category, c.category),
+            urls.c.url,
+            c.edition,
+        )
+        .select_from(urls)
+        .outerjoin(s, s.url == urls.c.url)
+        .outerjoin(c, c.url == urls.c.url)
+        # SQLite needs a WHERE before ON CONFLICT in INSERT … SELECT … upserts
+        .where(true())
+    )
+    stmt = insert(Entry).from_select(["name", "category", "url", "edition"], merged)
+    entries = Entry.__table__.c
+    edition = func.coalesce(stmt.excluded.edition, entries.edition)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["url"],
+        set_={
+            "name": stmt.excluded.name,
+            "category": stmt.excluded.category,
+            "edition": edition,
+        },
+        # Skip no-op updates so updated_at and the rowcount reflect real changes
+        where=or_(
+            entries.name.is_not(stmt.excluded.name),
+            entries.category.is_not(stmt.excluded.category),
+            entries.edition.is_not(edition),
+        ),
+    )
+    result = db.execute(stmt)
+    db.commit()
+    return result.rowcount
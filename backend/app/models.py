@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, String, func
+from sqlalchemy import Boolean, DateTime, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -20,3 +20,94 @@ class Entry(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
+
+
+class CdxPageCheckpoint(Base):
+    """A finished Common Crawl CDX page query, journaled for --resume."""
+
+    __tablename__ = "cc_cdx_pages"
+
+    crawl_id: Mapped[str] = mapped_column(String(100), primary_key=True)
+    prefix: Mapped[str] = mapped_column(String(200), primary_key=True)
+    page: Mapped[int] = mapped_column(primary_key=True)
+    num_pages: Mapped[int] = mapped_column()
+    # Raw CDX records as a JSON list, replayed through the capture merge on resume
+    records: Mapped[str] = mapped_column(Text)
+    completed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+class WarcCheckpoint(Base):
+    """A classified WARC fetch result, journaled for --resume."""
+
+    __tablename__ = "cc_warc_results"
+
+    url: Mapped[str] = mapped_column(String(2000), primary_key=True)
+    # CDX timestamp of the capture that was classified; a newer capture found
+    # on resume invalidates the result
+    timestamp: Mapped[str] = mapped_column(String(14))
+    name: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    edition: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    is_homebrew: Mapped[bool] = mapped_column(Boolean, default=False)
+    completed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+class SitemapStaging(Base):
+    """Sitemap scraper output, one row per URL, merged by app.merge.
+
+    Also holds each URL's last-seen <lastmod> for delta scraping.
+    `needs_edition_check` marks URLs that are new or whose <lastmod> changed
+    since their edition was last classified — the Common Crawl scraper's
+    work queue.
+    """
+
+    __tablename__ = "staged_sitemap_entries"
+
+    url: Mapped[str] = mapped_column(String(2000), primary_key=True)
+    name: Mapped[str] = mapped_column(String(500))
+    category: Mapped[str] = mapped_column(String(100))
+    lastmod: Mapped[str | None] = mapped_column(String(40), nullable=True)
+    needs_edition_check: Mapped[bool] = mapped_column(Boolean, default=True)
+    # Provenance: the sub-sitemap the URL was listed in, and when
+    sitemap_url: Mapped[str] = mapped_column(String(2000))
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class CommonCrawlStaging(Base):
+    """Common Crawl scraper output, one row per URL, merged by app.merge."""
+
+    __tablename__ = "staged_commoncrawl_entries"
+
+    url: Mapped[str] = mapped_column(String(2000), primary_key=True)
+    # Slug-derived name, and the page-title name when a WARC record provided one
+    name: Mapped[str] = mapped_column(String(500))
+    title_name: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    category: Mapped[str] = mapped_column(String(100))
+    edition: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    # Provenance: the crawl and capture the row was built from, and when
+    crawl_id: Mapped[str] = mapped_column(String(100))
+    capture_timestamp: Mapped[str] = mapped_column(String(14))
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class LinkCheck(Base):
+    """Latest liveness check of an entry URL, written by scripts.check_links."""
+
+    __tablename__ = "link_checks"
+
+    url: Mapped[str] = mapped_column(String(2000), primary_key=True)
+    # "ok", "dead" (404/410, dropped by the export) or "error" (inconclusive)
+    status: Mapped[str] = mapped_column(String(20))
+    status_code: Mapped[int | None] = mapped_column(nullable=True)
+    final_url: Mapped[str | None] = mapped_column(String(2000), nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    checked_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
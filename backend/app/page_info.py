@@ -0,0 +1,125 @@
+"""
+Single-pass extraction of D&D Beyond page metadata from a streamed HTML body.
+
+One scan of the byte stream yields the page title, canonical URL, and the
+homebrew/legacy markers, stopping early once the answer can't change.
+"""
+
+import codecs
+from collections.abc import Iterable
+from dataclasses import dataclass
+from html.parser import HTMLParser
+
+# D&D Beyond banner text present on all legacy (2014) content pages
+LEGACY_BANNER_TEXT = "doesn't reflect the latest rules and lore"
+
+# Class attribute present on homebrew content pages but not on official
+# content; matched as the whole attribute value, like the original
+# `class="i-homebrew"` substring check
+HOMEBREW_CLASS = "i-homebrew"
+
+TITLE_SUFFIX = " - D&D Beyond"
+
+
+@dataclass
+class PageInfo:
+    title: str | None = None
+    canonical_url: str | None = None
+    is_homebrew: bool = False
+    is_legacy: bool = False
+
+    @property
+    def edition(self) -> str:
+        return "legacy" if self.is_legacy else "2024"
+
+
+def name_from_title(title: str) -> str | None:
+    """Convert 'Abi-Dalzim's Horrid Wilting - Spells - D&D Beyond' → the name."""
+    title = " ".join(title.split())
+    if title.endswith(TITLE_SUFFIX):
+        title = title[: -len(TITLE_SUFFIX)]
+        # Drop the section segment ("Spells", "Monsters", ...) when present
+        head, sep, _ = title.rpartition(" - ")
+        if sep:
+            title = head
+    return title or None
+
+
+class PageInfoParser(HTMLParser):
+    """Incremental parser; feed decoded chunks and check `done` between them."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.info = PageInfo()
+        self._og_title: str | None = None
+        self._title_parts: list[str] | None = None
+        # Tail of the current text run, so the banner is found even when a
+        # chunk boundary splits it
+        self._text_tail = ""
+
+    @property
+    def title(self) -> str | None:
+        return self._og_title or self.info.title
+
+    @property
+    def done(self) -> bool:
+        """True once more input can't change the result.
+
+        Only a homebrew marker settles the page: it wins over the legacy
+        banner, and its absence is only known at end of input. Legacy and 2024
+        pages without one are always scanned in full.
+        """
+        return (
+            self.info.is_homebrew and bool(self.title) and bool(self.info.canonical_url)
+        )
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._text_tail = ""
+        attr = {k: v or "" for k, v in attrs}
+        if attr.get("class") == HOMEBREW_CLASS:
+            self.info.is_homebrew = True
+        # The banner counts anywhere in the markup, attribute values included
+        if any(LEGACY_BANNER_TEXT in value for value in attr.values()):
+            self.info.is_legacy = True
+        if tag == "title" and self.info.title is None:
+            self._title_parts = []
+        elif tag == "meta" and attr.get("property") == "og:title":
+            self._og_title = attr.get("content", "").strip() or None
+        elif tag == "link" and "canonical" in attr.get("rel", "").lower().split():
+            self.info.canonical_url = attr.get("href", "").strip() or None
+
+    def handle_endtag(self, tag: str) -> None:
+        self._text_tail = ""
+        if tag == "title" and self._title_parts is not None:
+            self.info.title = "".join(self._title_parts).strip() or None
+            self._title_parts = None
+
+    def handle_comment(self, data: str) -> None:
+        if LEGACY_BANNER_TEXT in data:
+            self.info.is_legacy = True
+
+    def handle_data(self, data: str) -> None:
+        # Also receives <script>/<style> contents, which HTMLParser treats as text
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+        if not self.info.is_legacy:
+            text = self._text_tail + data
+            if LEGACY_BANNER_TEXT in text:
+                self.info.is_legacy = True
+            self._text_tail = text[-len(LEGACY_BANNER_TEXT) :]
+
+
+def extract_page_info(chunks: Iterable[bytes]) -> PageInfo:
+    """Scan UTF-8 HTML chunks once, stopping as soon as every field is settled."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    parser = PageInfoParser()
+    for chunk in chunks:
+        parser.feed(decoder.decode(chunk))
+        if parser.done:
+            break
+    else:
+        parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+    info = parser.info
+    info.title = parser.title
+    return info
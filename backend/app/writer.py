@@ -0,0 +1,118 @@
+"""
+Background database writer for streaming scrape results.
+
+Scrapers hand rows to a `BackgroundWriter` as soon as they are ready. A
+dedicated thread batches them into periodic transactions, so DB writes overlap
+network work and rows don't pile up in memory until the end of the run.
+"""
+
+import queue
+import threading
+import time
+from collections.abc import Callable
+
+from sqlalchemy.orm import Session
+
+from app.database import get_session
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 2.0
+DEFAULT_MAX_PENDING = 5000
+
+# Queue sentinel telling the writer thread to flush and exit
+_STOP = object()
+
+
+class BackgroundWriter:
+    """Single writer thread fed by a bounded queue.
+
+    `write_batch(rows, db)` executes the statements for one batch and returns
+    its rowcount; the writer commits after each batch. A batch is written when
+    it reaches `batch_size` rows or `flush_interval` seconds after the previous
+    write, whichever comes first. `put` blocks while `max_pending` rows are
+    queued, so a slow database applies back-pressure instead of growing memory.
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[list[dict], Session], int],
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        session_factory: Callable[[], Session] = get_session,
+    ):
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.session_factory = session_factory
+        self.rows_written = 0
+        self.rows_affected = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._error: BaseException | None = None
+
+    def __enter__(self) -> "BackgroundWriter":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        # Flush whatever was queued even when the producer is failing
+        self.close()
+
+    def put(self, row: dict) -> None:
+        self._enqueue(row)
+
+    def close(self) -> None:
+        """Flush remaining rows, stop the thread, and re-raise any write error."""
+        if self._thread.is_alive():
+            self._enqueue(_STOP)
+            self._thread.join()
+        self._raise_if_failed()
+
+    def _enqueue(self, item: object) -> None:
+        # Poll so a dead writer thread surfaces as an error, not a hang
+        while True:
+            self._raise_if_failed()
+            try:
+                self._queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("Background DB writer failed") from self._error
+
+    def _run(self) -> None:
+        db = self.session_factory()
+        batch: list[dict] = []
+        deadline = time.monotonic() + self.flush_interval
+        try:
+            while True:
+                try:
+                    item = self._queue.get(
+                        timeout=max(0.0, deadline - time.monotonic())
+                    )
+                except queue.Empty:
+                    item = None
+                if item is _STOP:
+                    break
+                if item is not None:
+                    batch.append(item)
+                if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                    self._flush(batch, db)
+                    batch = []
+                    deadline = time.monotonic() + self.flush_interval
+            self._flush(batch, db)
+        except BaseException as e:
+            self._error = e
+        finally:
+            db.close()
+
+    def _flush(self, batch: list[dict], db: Session) -> None:
+        if not batch:
+            return
+        self.rows_affected += self.write_batch(batch, db)
+        db.commit()
+        self.rows_written += len(batch)
@@ -0,0 +1,209 @@
+"""
+Check that entry URLs still resolve and record the results in link_checks.
+
+export_entries drops entries whose last check found them gone (404/410), so
+dead links stop shipping without hand-written delete overrides. Results are
+cached: a URL is re-checked only once its last result is older than
+--ttl-days. Inconclusive results (network errors, 403, 429, 5xx) are retried
+on every run and never drop an entry.
+
+Each URL gets a HEAD request first. Any non-2xx answer is confirmed with a GET
+(body not downloaded), since some servers reject or mishandle HEAD. Checks run
+on a bounded thread pool that shares one pooled client, with requests to each
+host spaced --host-interval apart.
+
+Usage:
+    uv run python -m scripts.check_links
+    uv run python -m scripts.check_links --all
+    uv run python -m scripts.check_links --workers 32 --host-interval 0.05
+    uv run python -m scripts.check_links --dry-run
+"""
+
+import argparse
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing, nullcontext
+
+import httpx
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.sqlite import insert
+
+from app.database import create_tables, get_session
+from app.http import HostRateLimiter, HttpMetrics, create_client
+from app.models import Entry, LinkCheck
+from app.writer import BackgroundWriter
+
+DEFAULT_TTL_DAYS = 7.0
+DEFAULT_WORKERS = 16
+DEFAULT_HOST_INTERVAL = 0.1
+
+# Only statuses that say the resource is gone prune an entry; anything else
+# unsuccessful (bot blocking, rate limiting, outages) is inconclusive
+DEAD_STATUSES = frozenset({404, 410})
+
+
+def classify(status_code: int) -> str:
+    """Return 'ok', 'dead' or 'error' for a final response status."""
+    if 200 <= status_code < 300:
+        return "ok"
+    return "dead" if status_code in DEAD_STATUSES else "error"
+
+
+def check_url(url: str, client: httpx.Client, limiter: HostRateLimiter) -> dict:
+    """Check one URL with HEAD, falling back to GET; return a link_checks row."""
+    try:
+        limiter.wait(url)
+        resp = client.head(url, follow_redirects=True)
+        if not resp.is_success:
+            limiter.wait(url)
+            # Leaving the block closes the stream without reading the body
+            with client.stream("GET", url, follow_redirects=True) as resp:
+                pass
+    except httpx.HTTPError as e:
+        return {
+            "url": url,
+            "status": "error",
+            "status_code": None,
+            "final_url": None,
+            "error": f"{type(e).__name__}: {e}",
+        }
+    final_url = str(resp.url)
+    return {
+        "url": url,
+        "status": classify(resp.status_code),
+        "status_code": resp.status_code,
+        "final_url": final_url if final_url != url else None,
+        "error": None,
+    }
+
+
+def check_urls(
+    urls: Iterable[str],
+    client: httpx.Client,
+    *,
+    workers: int = DEFAULT_WORKERS,
+    host_interval: float = DEFAULT_HOST_INTERVAL,
+) -> Iterator[dict]:
+    """Check URLs on a thread pool, yielding results as they complete."""
+    limiter = HostRateLimiter(host_interval)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(check_url, url, client, limiter) for url in urls]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def stale_urls(db, ttl_days: float) -> list[str]:
+    """Return entry URLs never checked, last inconclusive, or older than the TTL."""
+    # checked_at is stored by SQLite's CURRENT_TIMESTAMP, so compare in SQL
+    cutoff = func.datetime("now", f"-{ttl_days} days")
+    stmt = (
+        select(Entry.url)
+        .outerjoin(LinkCheck, LinkCheck.url == Entry.url)
+        .where(
+            or_(
+                LinkCheck.url.is_(None),
+                LinkCheck.status == "error",
+                LinkCheck.checked_at < cutoff,
+            )
+        )
+        .order_by(Entry.url)
+    )
+    return list(db.scalars(stmt))
+
+
+def record_checks(rows: list[dict], db) -> int:
+    """Upsert check results into link_checks."""
+    if not rows:
+        return 0
+    stmt = insert(LinkCheck).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["url"],
+        set_={
+            "status": stmt.excluded.status,
+            "status_code": stmt.excluded.status_code,
+            "final_url": stmt.excluded.final_url,
+            "error": stmt.excluded.error,
+            "checked_at": func.now(),
+        },
+    )
+    result = db.execute(stmt)
+    return result.rowcount
+
+
+def main(argv: list[str] | None = None, prog: str | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog=prog, description="Check that entry URLs still resolve"
+    )
+    parser.add_argument(
+        "--ttl-days",
+        type=float,
+        default=DEFAULT_TTL_DAYS,
+        help="Re-check URLs whose last result is older than this "
+        f"(default: {DEFAULT_TTL_DAYS:g})",
+    )
+    parser.add_argument(
+        "--all", action="store_true", help="Check every URL, ignoring cached results"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Concurrent checks (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--host-interval",
+        type=float,
+        default=DEFAULT_HOST_INTERVAL,
+        help="Minimum seconds between request starts to one host "
+        f"(default: {DEFAULT_HOST_INTERVAL:g})",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Print results without storing them"
+    )
+    args = parser.parse_args(argv)
+
+    create_tables()
+    with closing(get_session()) as db:
+        if args.all:
+            urls = list(db.scalars(select(Entry.url).order_by(Entry.url)))
+        else:
+            urls = stale_urls(db, args.ttl_days)
+    print(f"Checking {len(urls)} URLs ({args.workers} workers)...")
+
+    statuses: Counter[str] = Counter()
+    dead: list[str] = []
+    writer = None if args.dry_run else BackgroundWriter(record_checks)
+
+    metrics = HttpMetrics()
+    with (
+        create_client(max_connections=args.workers, metrics=metrics) as client,
+        writer or nullcontext(),
+    ):
+        results = check_urls(
+            urls, client, workers=args.workers, host_interval=args.host_interval
+        )
+        for i, row in enumerate(results, 1):
+            statuses[row["status"]] += 1
+            if row["status"] == "dead":
+                dead.append(row["url"])
+            if writer is None:
+                print(f"  [{row['status']}] {row['status_code']} {row['url']}")
+            else:
+                writer.put(row)
+            if i % 500 == 0:
+                print(f"  {i}/{len(urls)} checked")
+
+    print(f"\nHTTP: {metrics.summary()}")
+    print(
+        f"{statuses['ok']} ok, {statuses['dead']} dead, "
+        f"{statuses['error']} inconclusive"
+    )
+    for url in sorted(dead):
+        print(f"  dead: {url}")
+    if writer is not None:
+        print(f"Recorded {writer.rows_written} results.")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,8 @@ from pathlib import Path
 
 import httpx
 
+from app.http import HttpMetrics, create_client
+
 REPO_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_ENTRIES = REPO_ROOT / "frontend" / "public" / "entries.json"
 
@@ -37,7 +39,7 @@ CATEGORY_MAP: list[tuple[str, str]] = [
 
 def fetch_srd(filename: str, client: httpx.Client) -> list[dict]:
     url = f"{SRD_BASE_URL}/{filename}.json"
-    resp = client.get(url, timeout=30)
+    resp = client.get(url)
     resp.raise_for_status()
     return resp.json()
 
@@ -60,9 +62,9 @@ def load_entries(path: Path, edition_filter: str | None) -> dict[str, set[str]]:
     return by_category
 
 
-def main() -> None:
+def main(argv: list[str] | None = None, prog: str | None = None) -> None:
     parser = argparse.ArgumentParser(
-        description="Evaluate dataset completeness against the 5e SRD"
+        prog=prog, description="Evaluate dataset completeness against the 5e SRD"
     )
     parser.add_argument(
         "--entries",
@@ -76,7 +78,7 @@ def main() -> None:
         default=None,
         help="Only consider our entries with this edition (default: all editions)",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     print(f"Loading entries from {args.entries}...")
     our_entries = load_entries(args.entries, args.edition)
@@ -86,7 +88,8 @@ def main() -> None:
 
     results: list[tuple[str, int, int, list[str]]] = []
 
-    with httpx.Client() as client:
+    metrics = HttpMetrics()
+    with create_client(metrics=metrics) as client:
         for filename, category in CATEGORY_MAP:
             print(f"Fetching SRD {category}...")
             srd_entries = fetch_srd(filename, client)
@@ -98,6 +101,7 @@ def main() -> None:
             covered = srd_total - len(missing)
 
             results.append((category, covered, srd_total, missing))
+    print(f"HTTP: {metrics.summary()}")
 
     print("\n" + "=" * 50)
     print("SRD Coverage Report")
@@ -1,10 +1,17 @@
 """
-Export the DB entries merged with overrides to a static JSON file for the frontend.
+Export the DB entries merged with overrides to a static JSON file for the frontend,
+plus a precomputed typo dictionary over the entry names for fuzzy search.
+
+Entries whose last link check (scripts.check_links) found them gone are left
+out unless --keep-dead-links is given. Overrides are applied afterwards, so an
+`add` row still restores a URL the checker considers dead.
 
 Usage:
     uv run python -m scripts.export_entries
     uv run python -m scripts.export_entries --overrides ../../data/overrides.csv
     uv run python -m scripts.export_entries --out ../../frontend/public/entries.json
+    uv run python -m scripts.export_entries --typos-out ../../frontend/public/typos.json
+    uv run python -m scripts.export_entries --keep-dead-links
 """
 
 import argparse
@@ -12,18 +19,31 @@ import csv
 import json
 from pathlib import Path
 
-from app.database import SessionLocal
-from app.models import Entry
+from sqlalchemy import select
+
+from app.database import create_tables, get_session
+from app.models import Entry, LinkCheck
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_OVERRIDES = REPO_ROOT / "data" / "overrides.csv"
 DEFAULT_OUT = REPO_ROOT / "frontend" / "public" / "entries.json"
+DEFAULT_TYPOS_OUT = REPO_ROOT / "frontend" / "public" / "typos.json"
 
 VALID_ACTIONS = {"add", "update", "delete"}
 
+# Typo dictionary bounds (mirrored by frontend/src/search/typos.ts via the
+# artifact): tokens shorter than TYPO_MIN_LENGTH get no fuzzy matching, tokens
+# of TYPO_LONG_LENGTH+ characters tolerate two edits, the rest one. Only the
+# first TYPO_PREFIX_LENGTH characters are indexed, as in SymSpell, which keeps
+# the number of deletes per word small; candidates are verified at query time.
+TYPO_MIN_LENGTH = 4
+TYPO_LONG_LENGTH = 8
+TYPO_MAX_DISTANCE = 2
+TYPO_PREFIX_LENGTH = 7
+
 
 def load_entries_from_db() -> list[dict]:
-    db = SessionLocal()
+    db = get_session()
     try:
         rows = db.query(Entry).order_by(Entry.name).all()
         return [
@@ -39,6 +59,15 @@ def load_entries_from_db() -> list[dict]:
         db.close()
 
 
+def load_dead_urls() -> set[str]:
+    """Return URLs whose most recent link check found them gone."""
+    db = get_session()
+    try:
+        return set(db.scalars(select(LinkCheck.url).where(LinkCheck.status == "dead")))
+    finally:
+        db.close()
+
+
 def load_overrides(path: Path) -> list[dict]:
     if not path.exists():
         return []
@@ -86,9 +115,63 @@ def apply_overrides(entries: list[dict], overrides: list[dict]) -> list[dict]:
     return sorted(by_url.values(), key=lambda e: e["name"].lower())
 
 
-def main() -> None:
+def name_tokens(name: str) -> list[str]:
+    """Split a name into search tokens the same way the frontend does."""
+    return name.lower().split()
+
+
+def typo_distance(token: str) -> int:
+    """Return the edit distance a token of this length tolerates."""
+    if len(token) < TYPO_MIN_LENGTH:
+        return 0
+    return TYPO_MAX_DISTANCE if len(token) >= TYPO_LONG_LENGTH else 1
+
+
+def deletes(word: str, distance: int) -> set[str]:
+    """Return word plus every non-empty string reachable by ≤ distance deletions."""
+    results = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1 :] for w in frontier for i in range(len(w))}
+        frontier.discard("")
+        results |= frontier
+    return results
+
+
+def build_typo_index(entries: list[dict]) -> dict:
+    """Build a symmetric-delete (SymSpell-style) dictionary over name tokens.
+
+    Maps every delete variant of each token's prefix to the tokens it came
+    from. At query time the frontend generates the same variants for a typed
+    word, so candidate corrections are found with hash lookups rather than by
+    computing edit distances against every entry.
+    """
+    words = sorted(
+        {
+            token
+            for entry in entries
+            for token in name_tokens(entry["name"])
+            if typo_distance(token)
+        }
+    )
+    index: dict[str, list[int]] = {}
+    for i, word in enumerate(words):
+        prefix = word[:TYPO_PREFIX_LENGTH]
+        for variant in deletes(prefix, typo_distance(word)):
+            index.setdefault(variant, []).append(i)
+    return {
+        "minLength": TYPO_MIN_LENGTH,
+        "longLength": TYPO_LONG_LENGTH,
+        "maxDistance": TYPO_MAX_DISTANCE,
+        "prefixLength": TYPO_PREFIX_LENGTH,
+        "words": words,
+        "deletes": index,
+    }
+
+
+def main(argv: list[str] | None = None, prog: str | None = None) -> None:
     parser = argparse.ArgumentParser(
-        description="Export DB entries + CSV overrides to entries.json"
+        prog=prog, description="Export DB entries + CSV overrides to entries.json"
     )
     parser.add_argument(
         "--overrides",
@@ -102,12 +185,34 @@ def main() -> None:
         default=DEFAULT_OUT,
         help=f"Output JSON path (default: {DEFAULT_OUT})",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--typos-out",
+        type=Path,
+        default=DEFAULT_TYPOS_OUT,
+        help=f"Output path for the typo dictionary (default: {DEFAULT_TYPOS_OUT})",
+    )
+    parser.add_argument(
+        "--keep-dead-links",
+        action="store_true",
+        help="Export entries whose last link check found them gone (only list them)",
+    )
+    args = parser.parse_args(argv)
 
+    create_tables()
     print("Loading entries from database...")
     entries = load_entries_from_db()
     print(f"  {len(entries)} entries loaded")
 
+    dead = load_dead_urls()
+    flagged = sorted(e["url"] for e in entries if e["url"] in dead)
+    if flagged:
+        action = "kept" if args.keep_dead_links else "dropped"
+        print(f"  {len(flagged)} entries with dead links {action}:")
+        for url in flagged:
+            print(f"    {url}")
+        if not args.keep_dead_links:
+            entries = [e for e in entries if e["url"] not in dead]
+
     print(f"Loading overrides from {args.overrides}...")
     overrides = load_overrides(args.overrides)
     print(f"  {len(overrides)} overrides found")
@@ -120,6 +225,15 @@ def main() -> None:
         json.dump(merged, f, ensure_ascii=False, separators=(",", ":"))
     print(f"Written to {args.out}")
 
+    typos = build_typo_index(merged)
+    args.typos_out.parent.mkdir(parents=True, exist_ok=True)
+    with args.typos_out.open("w", encoding="utf-8") as f:
+        json.dump(typos, f, ensure_ascii=False, separators=(",", ":"))
+    print(
+        f"Typo dictionary: {len(typos['words'])} words, "
+        f"{len(typos['deletes'])} delete keys → {args.typos_out}"
+    )
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,32 @@
+"""
+Merge the per-source staging tables into entries without re-running a scraper.
+
+The scrapers run this step themselves after staging; use it on its own after
+changing the precedence rules in app.merge.
+
+Usage:
+    uv run python -m scripts.merge_entries
+"""
+
+import argparse
+from contextlib import closing
+
+from app.database import create_tables, get_session
+from app.merge import merge_staged_entries
+
+
+def main(argv: list[str] | None = None, prog: str | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog=prog, description="Merge staged scraper output into entries"
+    )
+    parser.parse_args(argv)
+
+    create_tables()
+    print("Merging staged entries...")
+    with closing(get_session()) as db:
+        count = merge_staged_entries(db)
+    print(f"Done. {count} rows affected.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,58 @@
 """
-Scrape D&D Beyond content URLs from Common Crawl CDX API and upsert into DB.
+Scrape D&D Beyond content URLs from Common Crawl CDX API into its staging table,
+then merge all staged sources into entries.
 
 Usage:
     uv run python -m scripts.scrape_commoncrawl
     uv run python -m scripts.scrape_commoncrawl --limit 5 --crawls 1
     uv run python -m scripts.scrape_commoncrawl --dry-run
     uv run python -m scripts.scrape_commoncrawl --skip-warc
+    uv run python -m scripts.scrape_commoncrawl --resume
+    uv run python -m scripts.scrape_commoncrawl --changed-only
+    uv run python -m scripts.scrape_commoncrawl --changed-only --lookup-threshold 0
+
+With --changed-only and a short edition queue (see --lookup-threshold), each
+queued URL is looked up with exact-URL CDX queries instead of scanning every
+prefix, so a daily refresh costs CDX queries in proportion to what changed.
 """
 
 import argparse
+import io
+import json
 import re
-import time
+from collections.abc import Iterator
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing, contextmanager, nullcontext
 
 import httpx
+from sqlalchemy import and_, case, func, select, update
 from sqlalchemy.dialects.sqlite import insert
 from warcio.archiveiterator import ArchiveIterator
 
-from app.database import SessionLocal, create_tables
-from app.models import Entry
+from app.database import create_tables, get_session
+from app.http import HttpMetrics, RateLimiter, create_client
+from app.journal import CrawlJournal
+from app.lastmod import lastmod_timestamp
+from app.merge import merge_staged_entries
+from app.models import CommonCrawlStaging, SitemapStaging, WarcCheckpoint
+from app.page_info import PageInfo, extract_page_info, name_from_title
+from app.writer import BackgroundWriter
 
 CDX_API = "https://index.commoncrawl.org/{crawl_id}-index"
 COLLINFO_URL = "https://index.commoncrawl.org/collinfo.json"
 WARC_BASE = "https://data.commoncrawl.org"
 
-# D&D Beyond banner text present on all legacy (2014) content pages
-LEGACY_BANNER_TEXT = "doesn't reflect the latest rules and lore"
+# CDX index queries for large prefixes can take a while to start responding;
+# passed per request so WARC fetches keep the client's default timeout
+CDX_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+# Largest --changed-only queue looked up URL by URL. Each lookup costs one CDX
+# query per crawl until a capture turns up (usually the first), while a prefix
+# scan costs a page count plus at least one page per crawl × prefix.
+DEFAULT_LOOKUP_THRESHOLD = 100
 
-# Marker present on homebrew content pages but not on official content
-HOMEBREW_MARKER = 'class="i-homebrew"'
+# Decompressed bytes handed to the page extractor per read
+WARC_READ_SIZE = 16 * 1024
 
 # Map URL prefix → category name
 CONTENT_PREFIXES: list[tuple[str, str]] = [
@@ -63,28 +87,51 @@ def extract_name_from_url(url: str) -> str:
 
 
 def get_recent_crawl_ids(n: int, client: httpx.Client) -> list[str]:
-    resp = client.get(COLLINFO_URL, timeout=30)
+    resp = client.get(COLLINFO_URL)
     resp.raise_for_status()
     crawls = resp.json()
     # List is newest-first
     return [c["id"] for c in crawls[:n]]
 
 
+def get_cdx_num_pages(crawl_id: str, url_prefix: str, client: httpx.Client) -> int:
+    """Return how many index pages the CDX server holds for a prefix query."""
+    params = {
+        "url": f"{url_prefix}*",
+        "output": "json",
+        "showNumPages": "true",
+    }
+    api_url = CDX_API.format(crawl_id=crawl_id)
+    resp = client.get(api_url, params=params, timeout=CDX_TIMEOUT)
+    if resp.status_code == 404:
+        return 0
+    resp.raise_for_status()
+    return int(resp.json().get("pages") or 0)
+
+
 def query_cdx(
-    crawl_id: str, url_prefix: str, limit: int | None, client: httpx.Client
+    crawl_id: str,
+    url_prefix: str,
+    limit: int | None,
+    client: httpx.Client,
+    page: int | None = None,
+    exact: bool = False,
 ) -> list[dict]:
+    """Return CDX records under a URL prefix, or for one URL when `exact`."""
     params = {
-        "url": f"{url_prefix}*",
+        "url": url_prefix if exact else f"{url_prefix}*",
         "output": "json",
-        "fl": "url,status,filename,offset,length",
+        "fl": "url,status,timestamp,filename,offset,length",
         "filter": "status:200",
         "collapse": "urlkey",
     }
     if limit is not None:
         params["limit"] = str(limit)
+    if page is not None:
+        params["page"] = str(page)
 
     api_url = CDX_API.format(crawl_id=crawl_id)
-    resp = client.get(api_url, params=params, timeout=60)
+    resp = client.get(api_url, params=params, timeout=CDX_TIMEOUT)
     if resp.status_code == 404:
         return []
     resp.raise_for_status()
@@ -94,8 +141,6 @@ def query_cdx(
         if not line:
             continue
         try:
-            import json
-
             record = json.loads(line)
             results.append(record)
         except Exception:
@@ -103,10 +148,125 @@ def query_cdx(
     return results
 
 
-def fetch_warc_content(
+def canonical_content_url(url: str, prefix: str) -> str | None:
+    """Return the https form of a CDX URL, or None if it isn't a content page."""
+    clean_url = url.split("?")[0].rstrip("/")
+
+    # Strip protocol for prefix comparison
+    bare = clean_url.split("://", 1)[-1]
+    if not bare.startswith(prefix):
+        return None
+    slug_segment = bare[len(prefix) :]
+
+    # Remainder must be a single "{id}-{slug}" — rejects
+    # nested list/filter pages like spells/class/8-wizard
+    if not SLUG_PATTERN.match(slug_segment):
+        return None
+
+    # Use https canonical form
+    if not clean_url.startswith("http"):
+        clean_url = "https://" + clean_url
+    elif clean_url.startswith("http://"):
+        clean_url = "https://" + clean_url[7:]
+    return clean_url
+
+
+def merge_captures(
+    seen_urls: dict[str, dict],
+    records: list[dict],
+    crawl_id: str,
+    prefix: str,
+    category: str,
+) -> int:
+    """Merge CDX records into seen_urls, keeping the newest capture of each URL.
+
+    CDX timestamps are fixed-width YYYYMMDDhhmmss strings, so they compare
+    correctly as plain strings regardless of which crawl a record came from.
+    Returns the number of URLs not previously seen.
+    """
+    new_count = 0
+    for record in records:
+        clean_url = canonical_content_url(record.get("url", ""), prefix)
+        if clean_url is None:
+            continue
+
+        timestamp = record.get("timestamp") or ""
+        existing = seen_urls.get(clean_url)
+        if existing is not None and existing["_timestamp"] >= timestamp:
+            continue
+        if existing is None:
+            new_count += 1
+
+        seen_urls[clean_url] = {
+            "name": extract_name_from_url(clean_url),
+            "category": existing["category"] if existing else category,
+            "url": clean_url,
+            "edition": None,
+            "_title_name": None,
+            "_crawl_id": crawl_id,
+            "_timestamp": timestamp,
+            "_warc_filename": record.get("filename"),
+            "_warc_offset": int(record.get("offset") or 0),
+            "_warc_length": int(record.get("length") or 0),
+        }
+    return new_count
+
+
+def prefix_for_url(url: str, prefixes: list[tuple[str, str]]) -> tuple[str, str] | None:
+    """Return the (prefix, category) a content URL falls under, if any."""
+    bare = url.split("://", 1)[-1]
+    for prefix, category in prefixes:
+        if bare.startswith(prefix):
+            return prefix, category
+    return None
+
+
+def find_newest_captures(
+    url: str, crawl_ids: list[str], client: httpx.Client, limiter: RateLimiter
+) -> tuple[str, list[dict]] | None:
+    """Look up one URL exactly in each crawl, newest first.
+
+    Stops at the first crawl with a capture: older crawls can't hold a newer
+    one. Returns (crawl_id, records), or None if no crawl has the URL.
+    """
+    bare = url.split("://", 1)[-1]
+    for crawl_id in crawl_ids:
+        limiter.wait()
+        records = query_cdx(crawl_id, bare, None, client, exact=True)
+        if records:
+            return crawl_id, records
+    return None
+
+
+class _ChunkReader(io.RawIOBase):
+    """Minimal file-like view over a byte-chunk iterator, for ArchiveIterator."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            self._pending = next(self._chunks, b"")
+            if not self._pending:
+                return 0
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+
+def fetch_warc_page_info(
     filename: str, offset: int, length: int, client: httpx.Client
-) -> str | None:
-    """Fetch a WARC record HTML body from Common Crawl S3 via an HTTP Range request."""
+) -> PageInfo | None:
+    """Stream a WARC record from Common Crawl S3 and extract its page metadata.
+
+    The record is decompressed and scanned as it arrives over an HTTP Range
+    request; the download is abandoned as soon as the extractor has its answer.
+    """
     s3_url = f"{WARC_BASE}/{filename}"
     byte_range = f"bytes={offset}-{offset + length - 1}"
     try:
@@ -114,76 +274,145 @@ def fetch_warc_content(
             "GET",
             s3_url,
             headers={"Range": byte_range},
-            timeout=30,
         ) as resp:
             if resp.status_code != 206:
                 return None
-            raw = resp.read()
-
-        import io
-
-        stream = ArchiveIterator(io.BytesIO(raw))
-        for warc_record in stream:
-            if warc_record.rec_type == "response":
-                content_bytes = warc_record.content_stream().read()
-                try:
-                    return content_bytes.decode("utf-8", errors="replace")
-                except Exception:
-                    return None
+            stream = ArchiveIterator(_ChunkReader(resp.iter_bytes()))
+            for warc_record in stream:
+                if warc_record.rec_type == "response":
+                    body = warc_record.content_stream()
+                    return extract_page_info(
+                        iter(lambda: body.read(WARC_READ_SIZE), b"")
+                    )
     except Exception as e:
         print(f"    WARC fetch error ({filename}): {e}")
     return None
 
 
-def is_homebrew(html: str) -> bool:
-    """Return True if the page is user-created homebrew content."""
-    return HOMEBREW_MARKER in html
-
-
-def detect_edition(html: str) -> str:
-    """Return 'legacy' if the page has the 2014 legacy banner, otherwise '2024'."""
-    if LEGACY_BANNER_TEXT in html:
-        return "legacy"
-    return "2024"
-
-
 def _process_warc_entry(
     url: str, entry: dict, client: httpx.Client
-) -> tuple[str, str | None, bool]:
-    """Fetch a single WARC record; return (url, edition_or_None, is_homebrew)."""
+) -> tuple[str, PageInfo | None]:
+    """Fetch a single WARC record; return (url, page_info_or_None)."""
     filename = entry.get("_warc_filename")
     offset = entry.get("_warc_offset", 0)
     length = entry.get("_warc_length", 0)
     if not filename or not length:
-        return (url, None, False)
-    html = fetch_warc_content(filename, offset, length, client)
-    if html is None:
-        return (url, None, False)
-    if is_homebrew(html):
-        return (url, None, True)
-    return (url, detect_edition(html), False)
+        return (url, None)
+    return (url, fetch_warc_page_info(filename, offset, length, client))
+
+
+def page_name(url: str, info: PageInfo) -> str | None:
+    """Return the display name from the page title, if it belongs to this URL.
+
+    A canonical link pointing elsewhere means the capture isn't this entry's
+    page (e.g. a redirect), so its title can't be trusted for the name.
+    """
+    if not info.title:
+        return None
+    if info.canonical_url:
+        canonical = info.canonical_url.split("?")[0].rstrip("/")
+        if canonical.split("://", 1)[-1] != url.split("://", 1)[-1]:
+            return None
+    return name_from_title(info.title)
+
+
+def current_warc_results(
+    seen_urls: dict[str, dict], results: dict[str, WarcCheckpoint]
+) -> dict[str, WarcCheckpoint]:
+    """Return the journaled WARC results that still apply on resume.
+
+    A result only applies if it classified the same capture this run selected;
+    a newer capture found since then has to be fetched again.
+    """
+    return {
+        url: result
+        for url, result in results.items()
+        if url in seen_urls and seen_urls[url]["_timestamp"] == result.timestamp
+    }
+
 
+def load_edition_queue(db) -> dict[str, str | None]:
+    """Return {url: lastmod} for sitemap URLs awaiting edition detection."""
+    rows = db.execute(
+        select(SitemapStaging.url, SitemapStaging.lastmod).where(
+            SitemapStaging.needs_edition_check
+        )
+    )
+    return {url: lastmod for url, lastmod in rows}
 
-def upsert_entries(entries: list[dict], db) -> int:
-    if not entries:
+
+def capture_is_current(timestamp: str, lastmod: str | None) -> bool:
+    """Return True if a CDX capture is no older than the page's sitemap <lastmod>.
+
+    Both are compared as UTC YYYYMMDDhhmmss strings; a date-only lastmod
+    compares as the start of that day. A missing or unparseable lastmod can't
+    show the capture is stale, so it counts as current.
+    """
+    instant = lastmod_timestamp(lastmod) if lastmod else None
+    return instant is None or timestamp >= instant
+
+
+def mark_edition_checked(urls: list[str], db) -> None:
+    """Remove URLs from the sitemap edition-detection queue."""
+    for i in range(0, len(urls), 500):
+        db.execute(
+            update(SitemapStaging)
+            .where(SitemapStaging.url.in_(urls[i : i + 500]))
+            .values(needs_edition_check=False)
+        )
+    db.commit()
+
+
+def stage_entries(rows: list[dict], db) -> int:
+    """Upsert rows into the Common Crawl staging table.
+
+    A capture without a usable WARC record (NULL edition) doesn't erase what an
+    earlier capture of the same URL established: the row keeps that capture's
+    edition, title name and provenance together.
+    """
+    if not rows:
         return 0
-    stmt = insert(Entry).values(entries)
+    stmt = insert(CommonCrawlStaging).values(rows)
+    staged = CommonCrawlStaging.__table__.c
+    keep_classified = and_(stmt.excluded.edition.is_(None), staged.edition.is_not(None))
+    capture_columns = ["title_name", "edition", "crawl_id", "capture_timestamp"]
     stmt = stmt.on_conflict_do_update(
         index_elements=["url"],
         set_={
             "name": stmt.excluded.name,
             "category": stmt.excluded.category,
-            "edition": stmt.excluded.edition,
+            **{
+                column: case(
+                    (keep_classified, staged[column]), else_=stmt.excluded[column]
+                )
+                for column in capture_columns
+            },
+            "fetched_at": func.now(),
         },
     )
     result = db.execute(stmt)
-    db.commit()
     return result.rowcount
 
 
-def main():
+@contextmanager
+def worker_pool(max_workers: int) -> Iterator[ThreadPoolExecutor]:
+    """A thread pool that drops its queued tasks if the block raises.
+
+    A plain `with ThreadPoolExecutor` runs every queued task to completion on
+    the way out, so Ctrl-C would wait for (and discard) thousands of fetches.
+    Only tasks already running are waited for.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        try:
+            yield pool
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+def main(argv: list[str] | None = None, prog: str | None = None) -> None:
     parser = argparse.ArgumentParser(
-        description="Scrape D&D Beyond URLs from Common Crawl"
+        prog=prog, description="Scrape D&D Beyond URLs from Common Crawl"
     )
     parser.add_argument(
         "--limit", type=int, default=None, help="Max results per category per crawl"
@@ -211,7 +440,43 @@ def main():
         default=5,
         help="Number of parallel WARC fetch workers (default: 5)",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--cdx-workers",
+        type=int,
+        default=3,
+        help="Number of parallel CDX page queries (default: 3)",
+    )
+    parser.add_argument(
+        "--cdx-interval",
+        type=float,
+        default=1.5,
+        help="Minimum seconds between CDX request starts (default: 1.5)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its checkpoint journal "
+        "(use the same arguments as the interrupted run)",
+    )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="Only classify and upsert URLs queued by the sitemap scraper as new "
+        "or modified",
+    )
+    parser.add_argument(
+        "--lookup-threshold",
+        type=int,
+        default=DEFAULT_LOOKUP_THRESHOLD,
+        help="With --changed-only, look queued URLs up individually when there "
+        "are at most this many, instead of scanning every prefix "
+        f"(default: {DEFAULT_LOOKUP_THRESHOLD})",
+    )
+    args = parser.parse_args(argv)
+    if args.changed_only and args.skip_warc:
+        parser.error("--changed-only needs WARC fetches; drop --skip-warc")
+    if args.dry_run and args.resume:
+        parser.error("--dry-run keeps no checkpoint journal, so it can't --resume")
 
     # Build the active prefix list, optionally filtered by --categories
     active_prefixes = CONTENT_PREFIXES
@@ -223,127 +488,302 @@ def main():
             parser.error(f"No matching categories found. Known categories: {known}")
 
     create_tables()
+    with closing(get_session()) as db:
+        edition_queue = load_edition_queue(db)
+    if args.changed_only:
+        print(f"{len(edition_queue)} sitemap URLs queued for edition detection")
+
+    # A dry run never touches the journal, so it can't clobber the checkpoint
+    # of an interrupted real run
+    journal = None if args.dry_run else CrawlJournal(get_session())
+    if journal is not None and not args.resume:
+        journal.reset()
+
+    # Finished entries stream to the DB writer thread during the WARC phase
+    writer = None if args.dry_run else BackgroundWriter(stage_entries)
+    dry_run_entries: list[dict] = []
+    emitted = 0
+
     print(f"Fetching {args.crawls} recent crawl IDs...")
-    limits = httpx.Limits(max_connections=args.warc_workers + 5)
-    with httpx.Client(limits=limits) as client:
+    metrics = HttpMetrics()
+    with (
+        create_client(
+            max_connections=args.warc_workers + args.cdx_workers + 2,
+            metrics=metrics,
+        ) as client,
+        closing(journal.db) if journal is not None else nullcontext(),
+        writer or nullcontext(),
+    ):
         crawl_ids = get_recent_crawl_ids(args.crawls, client)
         print(f"Crawls: {crawl_ids}")
 
-        # Collect all entries, deduplicated by URL, retaining WARC location metadata
+        # Newest capture of each URL across all crawls, with its WARC location
         seen_urls: dict[str, dict] = {}
-
-        for crawl_id in crawl_ids:
-            print(f"\n--- Crawl: {crawl_id} ---")
-            for prefix, category in active_prefixes:
-                print(f"  Querying {category} ({prefix})...", end=" ", flush=True)
-                try:
-                    records = query_cdx(crawl_id, prefix, args.limit, client)
-                except httpx.HTTPError as e:
-                    print(f"ERROR: {e}")
+        limiter = RateLimiter(args.cdx_interval)
+
+        # Replay journaled CDX pages so only unfinished queries hit the network
+        prefix_categories = dict(active_prefixes)
+        done_pages: set[tuple[str, str, int]] = set()
+        known_page_counts: dict[tuple[str, str], int] = {}
+        if args.resume:
+            for crawl_id, prefix, page, num_pages, records in journal.completed_pages():
+                if crawl_id not in crawl_ids or prefix not in prefix_categories:
                     continue
+                merge_captures(
+                    seen_urls, records, crawl_id, prefix, prefix_categories[prefix]
+                )
+                done_pages.add((crawl_id, prefix, page))
+                known_page_counts[(crawl_id, prefix)] = num_pages
+            print(
+                f"Resuming: {len(done_pages)} CDX pages from the journal, "
+                f"{len(seen_urls)} entries so far"
+            )
 
-                count = 0
-                for record in records:
-                    url: str = record.get("url", "")
-                    clean_url = url.split("?")[0].rstrip("/")
-
-                    # Strip protocol for prefix comparison
-                    bare = clean_url.split("://", 1)[-1]
-                    if not bare.startswith(prefix):
+        # A short --changed-only queue is cheaper to look up URL by URL than to
+        # find by scanning every prefix. Lookups are quick, so they aren't
+        # journaled.
+        use_lookups = args.changed_only and len(edition_queue) <= args.lookup_threshold
+        scan_prefixes = [] if use_lookups else active_prefixes
+        if use_lookups:
+            queued = {
+                url: match
+                for url in edition_queue
+                if (match := prefix_for_url(url, active_prefixes))
+            }
+            print(
+                f"\nLooking up {len(queued)} queued URLs in CDX "
+                f"({len(crawl_ids)} crawls, newest first, "
+                f"{args.cdx_workers} workers)..."
+            )
+            with worker_pool(args.cdx_workers) as pool:
+                lookup_futures = {
+                    pool.submit(
+                        find_newest_captures, url, crawl_ids, client, limiter
+                    ): url
+                    for url in queued
+                }
+                for future in as_completed(lookup_futures):
+                    url = lookup_futures[future]
+                    prefix, category = queued[url]
+                    try:
+                        found = future.result()
+                    except httpx.HTTPError as e:
+                        print(f"  {url}: ERROR: {e}")
                         continue
-                    slug_segment = bare[len(prefix) :]
-
-                    # Remainder must be a single "{id}-{slug}" — rejects
-                    # nested list/filter pages like spells/class/8-wizard
-                    if not SLUG_PATTERN.match(slug_segment):
+                    if found is None:
                         continue
+                    crawl_id, records = found
+                    merge_captures(seen_urls, records, crawl_id, prefix, category)
+                    print(f"  {url}: {len(records)} captures in {crawl_id}")
+
+        def count_pages(crawl_id: str, prefix: str) -> int:
+            # --limit caps a single unpaginated query, so there's nothing to split
+            if args.limit is not None:
+                return 1
+            if (crawl_id, prefix) in known_page_counts:
+                return known_page_counts[(crawl_id, prefix)]
+            limiter.wait()
+            return get_cdx_num_pages(crawl_id, prefix, client)
+
+        def fetch_page(crawl_id: str, prefix: str, page: int | None) -> list[dict]:
+            limiter.wait()
+            return query_cdx(crawl_id, prefix, args.limit, client, page=page)
+
+        if scan_prefixes:
+            print(
+                f"\nQuerying CDX indexes ({len(crawl_ids)} crawls × "
+                f"{len(scan_prefixes)} prefixes, {args.cdx_workers} workers)..."
+            )
+        with worker_pool(args.cdx_workers) as pool:
+            count_futures = {
+                pool.submit(count_pages, crawl_id, prefix): (crawl_id, prefix, category)
+                for crawl_id in crawl_ids
+                for prefix, category in scan_prefixes
+            }
+            # Page queries are submitted as soon as each page count arrives, so
+            # every crawl's work is split into equal-sized pages across workers
+            page_futures = {}
+            for future in as_completed(count_futures):
+                crawl_id, prefix, category = count_futures[future]
+                try:
+                    num_pages = future.result()
+                except httpx.HTTPError as e:
+                    print(f"  {crawl_id} {category} ({prefix}): ERROR: {e}")
+                    continue
+                pages = [None] if args.limit is not None else range(num_pages)
+                pending = [
+                    page
+                    for page in pages
+                    if (crawl_id, prefix, page or 0) not in done_pages
+                ]
+                print(
+                    f"  {crawl_id} {category} ({prefix}): {num_pages} page(s), "
+                    f"{len(pending)} to fetch"
+                )
+                for page in pending:
+                    key = (crawl_id, prefix, category, page, num_pages)
+                    page_futures[pool.submit(fetch_page, crawl_id, prefix, page)] = key
+
+            for future in as_completed(page_futures):
+                crawl_id, prefix, category, page, num_pages = page_futures[future]
+                label = f"  {crawl_id} {category}"
+                if page is not None:
+                    label += f" page {page + 1}/{num_pages}"
+                try:
+                    records = future.result()
+                except httpx.HTTPError as e:
+                    print(f"{label}: ERROR: {e}")
+                    continue
+                if journal is not None:
+                    journal.record_page(crawl_id, prefix, page or 0, num_pages, records)
+                new_count = merge_captures(
+                    seen_urls, records, crawl_id, prefix, category
+                )
+                print(f"{label}: {len(records)} captures, {new_count} new entries")
+
+        if args.changed_only:
+            seen_urls = {u: e for u, e in seen_urls.items() if u in edition_queue}
+            missing = len(edition_queue) - len(seen_urls)
+            print(
+                f"\n{len(seen_urls)} queued URLs have captures"
+                + (f"; {missing} not in Common Crawl yet" if missing else "")
+            )
 
-                    # Use https canonical form
-                    if not clean_url.startswith("http"):
-                        clean_url = "https://" + clean_url
-                    elif clean_url.startswith("http://"):
-                        clean_url = "https://" + clean_url[7:]
-
-                    if clean_url not in seen_urls:
-                        name = extract_name_from_url(clean_url)
-                        seen_urls[clean_url] = {
-                            "name": name,
-                            "category": category,
-                            "url": clean_url,
-                            "edition": None,
-                            "_warc_filename": record.get("filename"),
-                            "_warc_offset": int(record.get("offset") or 0),
-                            "_warc_length": int(record.get("length") or 0),
-                        }
-                        count += 1
-
-                print(f"{count} new entries")
-                time.sleep(1.5)
+        # Capture timestamp of every URL whose edition/homebrew status was settled
+        classified: dict[str, str] = {}
 
         # Second pass: fetch WARC content in parallel, filter homebrew, detect edition
+        def emit(url: str) -> None:
+            """Hand a finished entry to the writer and drop it from memory."""
+            nonlocal emitted
+            entry = seen_urls.pop(url)
+            row = {
+                "url": entry["url"],
+                "name": entry["name"],
+                "title_name": entry["_title_name"],
+                "category": entry["category"],
+                "edition": entry["edition"],
+                "crawl_id": entry["_crawl_id"],
+                "capture_timestamp": entry["_timestamp"],
+            }
+            if writer is None:
+                dry_run_entries.append(row)
+            else:
+                writer.put(row)
+            emitted += 1
+
         if not args.skip_warc:
-            total = len(seen_urls)
+            homebrew_count = 0
+
+            # Journaled results still apply if they classified the same capture
+            to_fetch = dict(seen_urls)
+            if args.resume:
+                results = current_warc_results(seen_urls, journal.warc_results())
+                for url, result in results.items():
+                    entry = seen_urls[url]
+                    del to_fetch[url]
+                    classified[url] = result.timestamp
+                    if result.is_homebrew:
+                        seen_urls.pop(url)
+                        homebrew_count += 1
+                    else:
+                        entry["edition"] = result.edition
+                        entry["_title_name"] = result.name
+                        emit(url)
+                print(f"Resuming: {len(classified)} WARC results from the journal")
+
+            total = len(to_fetch)
             print(
-                f"\nFetching WARC records to detect edition "
+                f"\nFetching WARC records to detect edition and names "
                 f"({total} entries, {args.warc_workers} workers)..."
             )
-            homebrew_urls: list[str] = []
             completed = 0
 
-            with ThreadPoolExecutor(max_workers=args.warc_workers) as pool:
+            with worker_pool(args.warc_workers) as pool:
                 futures = {
                     pool.submit(_process_warc_entry, url, entry, client): url
-                    for url, entry in seen_urls.items()
+                    for url, entry in to_fetch.items()
                 }
-                for future in as_completed(futures):
-                    completed += 1
-                    url = futures[future]
-                    try:
-                        _, edition, is_brew = future.result()
-                    except Exception as e:
-                        print(f"  [{completed}/{total}] {url} ... ERROR: {e}")
-                        continue
-                    if is_brew:
-                        homebrew_urls.append(url)
-                        print(f"  [{completed}/{total}] {url} ... SKIP (homebrew)")
-                    elif edition:
-                        seen_urls[url]["edition"] = edition
-                        print(f"  [{completed}/{total}] {url} ... {edition}")
-                    else:
-                        print(f"  [{completed}/{total}] {url} ... edition=None")
-
-            for url in homebrew_urls:
-                seen_urls.pop(url, None)
-            if homebrew_urls:
-                print(f"Filtered {len(homebrew_urls)} homebrew entries.")
+                try:
+                    for future in as_completed(futures):
+                        completed += 1
+                        url = futures[future]
+                        try:
+                            _, info = future.result()
+                        except Exception as e:
+                            print(f"  [{completed}/{total}] {url} ... ERROR: {e}")
+                            continue
+                        entry = seen_urls[url]
+                        if info is None:
+                            print(f"  [{completed}/{total}] {url} ... edition=None")
+                            continue
+                        name = page_name(url, info)
+                        classified[url] = entry["_timestamp"]
+                        if journal is not None:
+                            journal.record_warc(
+                                url,
+                                entry["_timestamp"],
+                                name,
+                                info.edition,
+                                info.is_homebrew,
+                            )
+                        if info.is_homebrew:
+                            seen_urls.pop(url)
+                            homebrew_count += 1
+                            print(f"  [{completed}/{total}] {url} ... SKIP (homebrew)")
+                        else:
+                            entry["edition"] = info.edition
+                            entry["_title_name"] = name
+                            print(
+                                f"  [{completed}/{total}] {url} ... "
+                                f"{info.edition} ({name or entry['name']})"
+                            )
+                            emit(url)
+                finally:
+                    # Keep everything classified so far, even on Ctrl-C or a crash
+                    if journal is not None:
+                        journal.flush()
+
+            if homebrew_count:
+                print(f"Filtered {homebrew_count} homebrew entries.")
         else:
             print(
                 "\nSkipping WARC fetches (--skip-warc). Edition will be NULL. "
                 "Note: homebrew filtering is disabled when --skip-warc is used."
             )
 
-    # Strip internal WARC metadata keys before upserting
-    entries = [
-        {k: v for k, v in entry.items() if not k.startswith("_")}
-        for entry in seen_urls.values()
-    ]
-    print(f"\nTotal unique entries collected: {len(entries)}")
+        # Entries without a usable WARC record are stored with edition=NULL
+        for url in list(seen_urls):
+            emit(url)
+
+    print(f"\nHTTP: {metrics.summary()}")
+    print(f"Total unique entries collected: {emitted}")
 
-    if args.dry_run:
-        for e in entries[:20]:
+    if writer is None:
+        for e in dry_run_entries[:20]:
             edition_label = f" [{e['edition']}]" if e.get("edition") else ""
-            print(f"  [{e['category']}]{edition_label} {e['name']} → {e['url']}")
-        if len(entries) > 20:
-            print(f"  ... and {len(entries) - 20} more")
+            name = e["title_name"] or e["name"]
+            print(f"  [{e['category']}]{edition_label} {name} → {e['url']}")
+        if len(dry_run_entries) > 20:
+            print(f"  ... and {len(dry_run_entries) - 20} more")
         return
 
-    print("Upserting into database...")
-    db = SessionLocal()
-    try:
-        count = upsert_entries(entries, db)
-        print(f"Done. {count} rows affected.")
-    finally:
-        db.close()
+    print(f"Staged {writer.rows_affected} rows.")
+
+    # Dequeue sitemap URLs whose edition came from a capture at least as new
+    # as their <lastmod>; older captures stay queued for a later crawl
+    checked = [
+        url
+        for url, timestamp in classified.items()
+        if url in edition_queue and capture_is_current(timestamp, edition_queue[url])
+    ]
+    with closing(get_session()) as db:
+        mark_edition_checked(checked, db)
+        if checked:
+            print(f"{len(checked)} URLs removed from the edition-detection queue.")
+        print("Merging staged entries...")
+        count = merge_staged_entries(db)
+    print(f"Done. {count} rows affected.")
 
 
 if __name__ == "__main__":
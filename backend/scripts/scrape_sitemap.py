@@ -1,27 +1,39 @@
 """
-Scrape D&D Beyond content URLs from the official sitemap and upsert into DB.
+Scrape D&D Beyond content URLs from the official sitemap into its staging table,
+then merge all staged sources into entries.
 
 The sitemap provides a complete, authoritative list of official content URLs.
-Unlike Common Crawl, this doesn't include WARC data for edition detection,
-so entries are inserted with edition=NULL — any existing edition already in the
-database (from prior Common Crawl runs) is preserved.
+Unlike Common Crawl, this doesn't include WARC data for edition detection, so
+edition always comes from Common Crawl when the sources are merged (app.merge).
+
+Each URL's <lastmod> is stored alongside its staged row. Only URLs that are new
+or whose <lastmod> changed since the last run are staged (unless --full), and
+those are queued for the Common Crawl scraper's edition detection. Rows stream
+to a background DB writer while the remaining sitemaps are fetched.
 
 Usage:
     uv run python -m scripts.scrape_sitemap
     uv run python -m scripts.scrape_sitemap --dry-run
     uv run python -m scripts.scrape_sitemap --categories Spell Monster
+    uv run python -m scripts.scrape_sitemap --full
 """
 
 import argparse
 import re
 import xml.etree.ElementTree as ET
+from collections import Counter
+from contextlib import closing, nullcontext
 
 import httpx
-from sqlalchemy import func
+from sqlalchemy import func, or_, select
 from sqlalchemy.dialects.sqlite import insert
 
-from app.database import SessionLocal, create_tables
-from app.models import Entry
+from app.database import create_tables, get_session
+from app.http import HttpMetrics, create_client
+from app.lastmod import lastmod_timestamp
+from app.merge import merge_staged_entries
+from app.models import SitemapStaging
+from app.writer import BackgroundWriter
 
 SITEMAP_INDEX_URL = "https://www.dndbeyond.com/sitemap.xml"
 XML_NS = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
@@ -77,7 +89,7 @@ def classify_class_url(url: str) -> str:
 
 def fetch_sitemap_index(client: httpx.Client) -> list[tuple[str, str]]:
     """Fetch the sitemap index and return (sitemap_type, url) pairs for RPG content."""
-    resp = client.get(SITEMAP_INDEX_URL, timeout=30)
+    resp = client.get(SITEMAP_INDEX_URL)
     resp.raise_for_status()
     root = ET.fromstring(resp.content)
 
@@ -92,38 +104,90 @@ def fetch_sitemap_index(client: httpx.Client) -> list[tuple[str, str]]:
     return sitemaps
 
 
-def fetch_sitemap_urls(url: str, client: httpx.Client) -> list[str]:
-    """Fetch a single sitemap and return all <loc> URLs."""
+def fetch_sitemap_urls(url: str, client: httpx.Client) -> list[tuple[str, str | None]]:
+    """Fetch a single sitemap and return (<loc>, <lastmod>) pairs."""
     if url.startswith("http://"):
         url = "https://" + url[7:]
-    resp = client.get(url, timeout=30)
+    resp = client.get(url)
     resp.raise_for_status()
     root = ET.fromstring(resp.content)
-    return [loc.text for loc in root.findall("sm:url/sm:loc", XML_NS) if loc.text]
-
-
-def upsert_entries(entries: list[dict], db) -> int:
-    """Upsert entries, preserving existing edition values."""
-    if not entries:
+    results: list[tuple[str, str | None]] = []
+    for node in root.findall("sm:url", XML_NS):
+        loc = node.findtext("sm:loc", namespaces=XML_NS)
+        if not loc:
+            continue
+        lastmod = node.findtext("sm:lastmod", namespaces=XML_NS)
+        results.append((loc.strip(), lastmod.strip() if lastmod else None))
+    return results
+
+
+def load_known_lastmods(db) -> dict[str, str | None]:
+    """Return {url: lastmod} as recorded by the previous sitemap run."""
+    rows = db.execute(select(SitemapStaging.url, SitemapStaging.lastmod))
+    return {url: lastmod for url, lastmod in rows}
+
+
+def classify_change(
+    url: str, lastmod: str | None, known: dict[str, str | None]
+) -> str | None:
+    """Return 'new', 'modified', or None (unchanged) relative to the last run.
+
+    A URL counts as modified only when the sitemap gives a <lastmod> for a
+    different instant than the stored one, so a change of format or timezone
+    alone isn't a modification. A missing <lastmod> never forces a rewrite.
+    """
+    if url not in known:
+        return "new"
+    previous = known[url]
+    if not lastmod or lastmod == previous:
+        return None
+    instant = lastmod_timestamp(lastmod)
+    if instant is not None and previous and instant == lastmod_timestamp(previous):
+        return None
+    return "modified"
+
+
+def stage_entries(rows: list[dict], db) -> int:
+    """Upsert rows into the sitemap staging table.
+
+    Changed rows are queued for edition detection; unchanged rows (--full)
+    keep whatever queue state they already had.
+    """
+    if not rows:
         return 0
-    stmt = insert(Entry).values(entries)
+    values = [
+        {
+            "url": r["url"],
+            "name": r["name"],
+            "category": r["category"],
+            "lastmod": r["_lastmod"],
+            "needs_edition_check": r["_change"] is not None,
+            "sitemap_url": r["_sitemap_url"],
+        }
+        for r in rows
+    ]
+    stmt = insert(SitemapStaging).values(values)
+    staged = SitemapStaging.__table__.c
     stmt = stmt.on_conflict_do_update(
         index_elements=["url"],
         set_={
             "name": stmt.excluded.name,
             "category": stmt.excluded.category,
-            # Keep existing edition when the incoming value is NULL
-            "edition": func.coalesce(stmt.excluded.edition, Entry.__table__.c.edition),
+            "lastmod": stmt.excluded.lastmod,
+            "needs_edition_check": or_(
+                staged.needs_edition_check, stmt.excluded.needs_edition_check
+            ),
+            "sitemap_url": stmt.excluded.sitemap_url,
+            "fetched_at": func.now(),
         },
     )
     result = db.execute(stmt)
-    db.commit()
     return result.rowcount
 
 
-def main():
+def main(argv: list[str] | None = None, prog: str | None = None) -> None:
     parser = argparse.ArgumentParser(
-        description="Scrape D&D Beyond URLs from the official sitemap"
+        prog=prog, description="Scrape D&D Beyond URLs from the official sitemap"
     )
     parser.add_argument(
         "--dry-run", action="store_true", help="Print without inserting into DB"
@@ -134,19 +198,30 @@ def main():
         metavar="CATEGORY",
         help="Only scrape these categories (e.g. Spell Monster). Case-insensitive.",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Upsert every sitemap URL, not just those new or modified since "
+        "the last run",
+    )
+    args = parser.parse_args(argv)
 
     wanted = {c.lower() for c in args.categories} if args.categories else None
 
     create_tables()
+    with closing(get_session()) as db:
+        known = load_known_lastmods(db)
 
-    with httpx.Client() as client:
+    # Rows stream to the DB writer thread as each sitemap is parsed
+    changes: Counter[str | None] = Counter()
+    writer = None if args.dry_run else BackgroundWriter(stage_entries)
+
+    metrics = HttpMetrics()
+    with create_client(metrics=metrics) as client, writer or nullcontext():
         print("Fetching sitemap index...")
         sitemap_entries = fetch_sitemap_index(client)
         print(f"Found {len(sitemap_entries)} RPG sitemaps")
 
-        all_entries: list[dict] = []
-
         for sitemap_type, sitemap_url in sitemap_entries:
             is_class = sitemap_type == "rpgclass"
             category = SITEMAP_CATEGORIES.get(sitemap_type)
@@ -166,7 +241,7 @@ def main():
             urls = fetch_sitemap_urls(sitemap_url, client)
 
             batch: list[dict] = []
-            for url in urls:
+            for url, lastmod in urls:
                 clean_url = url.split("?")[0].rstrip("/")
                 if clean_url.startswith("http://"):
                     clean_url = "https://" + clean_url[7:]
@@ -180,17 +255,27 @@ def main():
 
                 slug = extract_slug(clean_url)
                 name = slug_to_name(slug)
+                change = classify_change(clean_url, lastmod, known)
+                changes[change] += 1
 
                 batch.append(
                     {
                         "name": name,
                         "category": entry_category,
                         "url": clean_url,
-                        "edition": None,
+                        "_lastmod": lastmod,
+                        "_change": change,
+                        "_sitemap_url": sitemap_url,
                     }
                 )
 
-            all_entries.extend(batch)
+            for entry in batch:
+                if not (args.full or entry["_change"]):
+                    continue
+                if writer is None:
+                    print(f"  [{entry['category']}] {entry['name']} → {entry['url']}")
+                else:
+                    writer.put(entry)
 
             if is_class:
                 n_class = sum(1 for e in batch if e["category"] == "Class")
@@ -199,20 +284,22 @@ def main():
             else:
                 print(f"  {len(batch)} entries")
 
-    print(f"\nTotal entries: {len(all_entries)}")
-
-    if args.dry_run:
-        for e in all_entries:
-            print(f"  [{e['category']}] {e['name']} → {e['url']}")
+    print(f"\nHTTP: {metrics.summary()}")
+    print(f"Total entries: {changes.total()}")
+    queued = changes["new"] + changes["modified"]
+    print(
+        f"  {changes['new']} new, {changes['modified']} modified, "
+        f"{changes[None]} unchanged since last run"
+    )
+    if writer is None:
         return
 
-    print("Upserting into database...")
-    db = SessionLocal()
-    try:
-        count = upsert_entries(all_entries, db)
-        print(f"Done. {count} rows affected.")
-    finally:
-        db.close()
+    print(f"Staged {writer.rows_affected} rows.")
+    print(f"{queued} URLs queued for edition detection.")
+    print("Merging staged entries...")
+    with closing(get_session()) as db:
+        count = merge_staged_entries(db)
+    print(f"Done. {count} rows affected.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,149 @@
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.http import create_client
+from app.models import Entry, LinkCheck
+from scripts.check_links import check_urls, record_checks, stale_urls
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Mimics the response patterns the checker has to tell apart."""
+
+    # (method, path) → count, shared across requests to one server
+    requests: Counter[tuple[str, str]]
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def respond(self, send_body: bool) -> None:
+        self.requests[self.command, self.path] += 1
+        if self.path == "/moved":
+            self.send_response(301)
+            self.send_header("Location", "/ok")
+        elif self.path == "/no-head" and self.command == "HEAD":
+            self.send_response(405)
+        elif self.path in ("/ok", "/no-head"):
+            self.send_response(200)
+        elif self.path == "/gone":
+            self.send_response(410)
+        elif self.path == "/blocked":
+            self.send_response(403)
+        else:
+            self.send_response(404)
+        body = b"x" * 1024 if send_body else b""
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server():
+    StandInHandler.requests = Counter()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(
+        target=httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def check(urls: list[str], **kwargs) -> dict[str, dict]:
+    with create_client(retries=0) as client:
+        kwargs.setdefault("host_interval", 0)
+        return {row["url"]: row for row in check_urls(urls, client, **kwargs)}
+
+
+def test_classifies_responses(server):
+    paths = ["/ok", "/moved", "/no-head", "/missing", "/gone", "/blocked"]
+    results = check([server + p for p in paths])
+
+    statuses = {url.removeprefix(server): row["status"] for url, row in results.items()}
+    assert statuses == {
+        "/ok": "ok",
+        "/moved": "ok",
+        "/no-head": "ok",
+        "/missing": "dead",
+        "/gone": "dead",
+        "/blocked": "error",
+    }
+    assert results[server + "/moved"]["final_url"] == server + "/ok"
+    assert results[server + "/ok"]["final_url"] is None
+
+
+def test_falls_back_to_get_only_when_head_fails(server):
+    check([server + "/ok", server + "/no-head"])
+
+    assert StandInHandler.requests == {
+        ("HEAD", "/ok"): 1,
+        ("HEAD", "/no-head"): 1,
+        ("GET", "/no-head"): 1,
+    }
+
+
+def test_connection_failure_is_inconclusive():
+    # Nothing listens on port 9 (discard) on the loopback interface
+    results = check(["http://127.0.0.1:9/"])
+    row = results["http://127.0.0.1:9/"]
+    assert row["status"] == "error"
+    assert row["status_code"] is None
+    assert row["error"].startswith("ConnectError")
+
+
+def test_spaces_requests_to_one_host(server):
+    start = time.monotonic()
+    check([f"{server}/ok?{i}" for i in range(4)], workers=4, host_interval=0.05)
+    assert time.monotonic() - start >= 0.15
+
+
+def add_entries(db: Session, *urls: str) -> None:
+    db.add_all(Entry(name=url, category="Spell", url=url) for url in urls)
+    db.commit()
+
+
+def result(url: str, status: str) -> dict:
+    return {
+        "url": url,
+        "status": status,
+        "status_code": None,
+        "final_url": None,
+        "error": None,
+    }
+
+
+def test_stale_urls_skips_fresh_results(db):
+    add_entries(db, "a", "b", "c", "d", "e")
+    statuses = {"a": "ok", "b": "dead", "c": "error", "d": "ok"}
+    record_checks([result(url, status) for url, status in statuses.items()], db)
+    db.execute(
+        update(LinkCheck)
+        .where(LinkCheck.url == "d")
+        .values(checked_at=datetime(2000, 1, 1))
+    )
+    db.commit()
+
+    # c was inconclusive, d is past the TTL, e was never checked
+    assert stale_urls(db, ttl_days=7) == ["c", "d", "e"]
+
+
+def test_record_checks_replaces_previous_result(db):
+    record_checks([result("a", "error")], db)
+    record_checks([result("a", "dead") | {"status_code": 404}], db)
+    db.commit()
+
+    check = db.get(LinkCheck, "a")
+    assert (check.status, check.status_code) == ("dead", 404)
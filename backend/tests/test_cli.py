@@ -0,0 +1,72 @@
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+HEAVY_MODULES = ("sqlalchemy", "pydantic_settings", "httpx", "warcio")
+
+# Cumulative import time allowed for the CLI module, in microseconds. Generous
+# enough for slow CI runners; a stray heavy import costs well over this.
+CLI_IMPORT_BUDGET_US = 100_000
+
+
+def run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_cli_import_does_not_load_heavy_modules():
+    result = run_python(
+        "import sys, app.cli\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_cli_import_time_budget():
+    result = run_python("import app.cli", "-X", "importtime")
+    # Lines look like: "import time:   self [us] | cumulative | module"
+    cumulative = {
+        parts[2].strip(): int(parts[1])
+        for line in result.stderr.splitlines()
+        if (parts := line.removeprefix("import time:").split("|"))[0].strip().isdigit()
+    }
+    assert cumulative["app.cli"] < CLI_IMPORT_BUDGET_US
+
+
+def test_help_lists_subcommands_without_heavy_imports():
+    result = run_python(
+        "import sys\n"
+        "from app.cli import main\n"
+        "try:\n"
+        "    main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    *usage, loaded = result.stdout.splitlines()
+    assert any("scrape-sitemap" in line for line in usage)
+    assert any("evaluate-completeness" in line for line in usage)
+    assert loaded == ""
+
+
+def test_importing_db_scripts_does_not_create_engine():
+    result = run_python(
+        "import scripts.export_entries\n"
+        "from app.database import get_engine\n"
+        "print(get_engine.cache_info().currsize)"
+    )
+    assert result.stdout.strip() == "0"
+
+
+def test_evaluate_completeness_does_not_import_sqlalchemy():
+    result = run_python(
+        "import sys, scripts.evaluate_completeness\nprint('sqlalchemy' in sys.modules)"
+    )
+    assert result.stdout.strip() == "False"
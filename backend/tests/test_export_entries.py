@@ -0,0 +1,56 @@
+import json
+
+from scripts.export_entries import (
+    DEFAULT_OUT,
+    DEFAULT_TYPOS_OUT,
+    build_typo_index,
+    deletes,
+    typo_distance,
+)
+
+
+def entries(*names: str) -> list[dict]:
+    return [{"name": name} for name in names]
+
+
+def test_typo_distance_by_length():
+    assert typo_distance("bolt") == 1
+    assert typo_distance("missile") == 1
+    assert typo_distance("fireball") == 2
+    assert typo_distance("orc") == 0
+
+
+def test_deletes():
+    assert deletes("abc", 1) == {"abc", "ab", "ac", "bc"}
+    assert deletes("ab", 2) == {"ab", "a", "b"}
+
+
+def test_index_words_are_lowercased_tokens():
+    index = build_typo_index(entries("Magic Missile", "Fireball", "Ice Orb"))
+    # "ice" and "orb" are too short for typo tolerance
+    assert index["words"] == ["fireball", "magic", "missile"]
+
+
+def test_deletes_map_prefix_variants_to_words():
+    index = build_typo_index(entries("Fireball", "Fire Bolt"))
+    words, lookup = index["words"], index["deletes"]
+    # Only the first 7 characters are indexed; "fireball" allows two deletes
+    assert "fireball" not in lookup
+    assert [words[i] for i in lookup["firebal"]] == ["fireball"]
+    assert [words[i] for i in lookup["frbal"]] == ["fireball"]
+    assert sorted(words[i] for i in lookup["bot"]) == ["bolt"]
+    assert sorted(words[i] for i in lookup["fire"]) == ["fire"]
+
+
+def test_shared_delete_keys_list_every_word():
+    index = build_typo_index(entries("Bolt", "Boot"))
+    words = index["words"]
+    assert sorted(words[i] for i in index["deletes"]["bot"]) == ["bolt", "boot"]
+
+
+def test_committed_typo_dictionary_matches_committed_entries():
+    # The deployed site only sees committed files, so the two must be
+    # regenerated together (`just export`)
+    entries = json.loads(DEFAULT_OUT.read_text(encoding="utf-8"))
+    typos = json.loads(DEFAULT_TYPOS_OUT.read_text(encoding="utf-8"))
+    assert typos == build_typo_index(entries)
@@ -0,0 +1,89 @@
+import time
+
+import httpx
+
+from app.http import (
+    ACCEPT_ENCODING,
+    USER_AGENT,
+    HostRateLimiter,
+    HttpMetrics,
+    create_client,
+)
+
+
+def make_client(handler, **kwargs) -> httpx.Client:
+    return create_client(transport=httpx.MockTransport(handler), **kwargs)
+
+
+def test_sends_standard_headers():
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200)
+
+    with make_client(handler) as client:
+        client.get("https://example.com/")
+
+    assert seen[0].headers["User-Agent"] == USER_AGENT
+    assert seen[0].headers["Accept-Encoding"] == ACCEPT_ENCODING
+
+
+def test_retries_retryable_status_and_records_metrics():
+    statuses = iter([503, 429, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(next(statuses), headers={"Retry-After": "0"})
+
+    metrics = HttpMetrics()
+    with make_client(handler, metrics=metrics) as client:
+        resp = client.get("https://example.com/")
+
+    assert resp.status_code == 200
+    assert metrics.retries == 2
+    assert metrics.requests == 1
+    assert metrics.statuses[200] == 1
+
+
+def test_gives_up_after_retry_budget():
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503, headers={"Retry-After": "0"})
+
+    with make_client(handler, retries=2) as client:
+        resp = client.get("https://example.com/")
+
+    assert resp.status_code == 503
+    assert calls == 3
+
+
+def test_does_not_retry_non_idempotent_requests():
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503)
+
+    with make_client(handler) as client:
+        resp = client.post("https://example.com/")
+
+    assert resp.status_code == 503
+    assert calls == 1
+
+
+def test_host_rate_limiter_spaces_each_host_separately():
+    limiter = HostRateLimiter(0.1)
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.wait("https://a.example/x")
+    # Three starts on one host need two intervals
+    assert time.monotonic() - start >= 0.2
+
+    # The other host has its own schedule, so it doesn't queue behind the first
+    start = time.monotonic()
+    limiter.wait("https://b.example/x")
+    assert time.monotonic() - start < 0.1
@@ -0,0 +1,81 @@
+import time
+
+from app.journal import CrawlJournal
+from scripts.scrape_commoncrawl import current_warc_results
+
+URL = "https://www.dndbeyond.com/spells/2618-fireball"
+
+
+def committed_warc_urls(journal: CrawlJournal) -> list[str]:
+    """Roll back the session first, so only committed rows are visible."""
+    journal.db.rollback()
+    return sorted(journal.warc_results())
+
+
+def record(journal: CrawlJournal, url: str = URL, timestamp: str = "20250101") -> None:
+    journal.record_warc(url, timestamp, "Fireball", "2024", False)
+
+
+def test_record_page_round_trips_and_upserts(db):
+    journal = CrawlJournal(db)
+    journal.record_page("CC-1", "spells/", 0, 2, [{"url": "a"}])
+    journal.record_page("CC-1", "spells/", 1, 2, [{"url": "b"}])
+    # A re-fetched page replaces its previous records
+    journal.record_page("CC-1", "spells/", 0, 3, [{"url": "c"}])
+
+    db.rollback()
+    assert sorted(journal.completed_pages()) == [
+        ("CC-1", "spells/", 0, 3, [{"url": "c"}]),
+        ("CC-1", "spells/", 1, 2, [{"url": "b"}]),
+    ]
+
+
+def test_record_warc_buffers_until_flush_interval(db):
+    journal = CrawlJournal(db, flush_interval=0.2)
+    record(journal, URL + "-1")
+    assert committed_warc_urls(journal) == []
+
+    time.sleep(0.21)
+    record(journal, URL + "-2")
+    # The interval elapsed, so both buffered results were committed
+    assert committed_warc_urls(journal) == [URL + "-1", URL + "-2"]
+
+
+def test_flush_commits_pending_results(db):
+    journal = CrawlJournal(db, flush_interval=3600)
+    record(journal)
+    record(journal, timestamp="20250202")
+    assert committed_warc_urls(journal) == []
+
+    journal.flush()
+    assert committed_warc_urls(journal) == [URL]
+    # The later result for the same URL wins
+    assert journal.warc_results()[URL].timestamp == "20250202"
+
+
+def test_reset_discards_all_checkpoints(db):
+    journal = CrawlJournal(db, flush_interval=0)
+    journal.record_page("CC-1", "spells/", 0, 1, [])
+    record(journal)
+    journal.reset()
+
+    db.rollback()
+    assert journal.completed_pages() == []
+    assert journal.warc_results() == {}
+
+
+def test_resume_ignores_results_for_an_older_capture(db):
+    other = URL.replace("fireball", "fire-bolt")
+    journal = CrawlJournal(db, flush_interval=0)
+    record(journal, URL, "20240101000000")
+    record(journal, other, "20250101000000")
+    results = journal.warc_results()
+
+    # This run found a newer capture of URL, so its journaled result is stale
+    seen_urls = {
+        URL: {"_timestamp": "20250301000000"},
+        other: {"_timestamp": "20250101000000"},
+    }
+    assert list(current_warc_results(seen_urls, results)) == [other]
+    # URLs no longer selected at all don't apply either
+    assert current_warc_results({}, results) == {}
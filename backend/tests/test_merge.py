@@ -0,0 +1,69 @@
+from sqlalchemy.orm import Session
+
+from app.merge import merge_staged_entries
+from app.models import CommonCrawlStaging, Entry, SitemapStaging
+
+URL = "https://www.dndbeyond.com/spells/1-abi-dalzims-horrid-wilting"
+
+
+def sitemap_row(url: str = URL, **kwargs) -> SitemapStaging:
+    values = {
+        "name": "Abi Dalzims Horrid Wilting",
+        "category": "Subclass",
+        "sitemap_url": "sitemap-rpgspell-1.xml",
+    }
+    return SitemapStaging(url=url, **(values | kwargs))
+
+
+def commoncrawl_row(url: str = URL, **kwargs) -> CommonCrawlStaging:
+    values = {
+        "name": "Abi Dalzims Horrid Wilting",
+        "category": "Spell",
+        "crawl_id": "CC-MAIN-2025-05",
+        "capture_timestamp": "20250101000000",
+    }
+    return CommonCrawlStaging(url=url, **(values | kwargs))
+
+
+def merged(db: Session) -> list[tuple]:
+    rows = db.query(Entry).order_by(Entry.url)
+    return [(e.url, e.name, e.category, e.edition) for e in rows]
+
+
+def test_precedence_between_sources(db):
+    db.add(sitemap_row())
+    db.add(commoncrawl_row(title_name="Abi-Dalzim's Horrid Wilting", edition="2024"))
+    db.commit()
+
+    assert merge_staged_entries(db) == 1
+    assert merged(db) == [(URL, "Abi-Dalzim's Horrid Wilting", "Subclass", "2024")]
+
+
+def test_single_source_rows_are_merged(db):
+    db.add(sitemap_row(url="a", name="Fireball", category="Spell"))
+    db.add(commoncrawl_row(url="b", name="Club", category="Equipment"))
+    db.commit()
+
+    merge_staged_entries(db)
+    assert merged(db) == [
+        ("a", "Fireball", "Spell", None),
+        ("b", "Club", "Equipment", None),
+    ]
+
+
+def test_existing_edition_survives_unclassified_capture(db):
+    db.add(Entry(url=URL, name="Old", category="Spell", edition="legacy"))
+    db.add(sitemap_row(category="Spell"))
+    db.commit()
+
+    merge_staged_entries(db)
+    assert merged(db) == [(URL, "Abi Dalzims Horrid Wilting", "Spell", "legacy")]
+
+
+def test_rerunning_merge_is_a_no_op(db):
+    db.add(sitemap_row())
+    db.add(commoncrawl_row(edition="legacy"))
+    db.commit()
+
+    assert merge_staged_entries(db) == 1
+    assert merge_staged_entries(db) == 0
@@ -0,0 +1,192 @@
+from collections.abc import Iterator
+
+import pytest
+
+from app.page_info import LEGACY_BANNER_TEXT, extract_page_info, name_from_title
+from scripts.scrape_commoncrawl import page_name
+
+URL = "https://www.dndbeyond.com/spells/2618-fireball"
+
+HEAD = f"""<!DOCTYPE html>
+<html><head>
+<meta charset="utf-8">
+<title>Fireball - Spells - D&amp;D Beyond</title>
+<link rel="canonical" href="{URL}">
+</head>"""
+
+LEGACY_PAGE = f"""{HEAD}
+<body><div class="page-banner">
+  <p>This page doesn't reflect the latest rules and lore. Learn more</p>
+</div><p>A bright streak flashes...</p></body></html>"""
+
+HOMEBREW_PAGE = f"""{HEAD}
+<body><span class="i-homebrew"></span><p>A homebrew fireball</p></body></html>"""
+
+PAGE_2024 = f"""{HEAD}
+<body><span class="i-homebrew-filter i-spell"></span>
+<p>A bright streak flashes from your pointing finger.</p></body></html>"""
+
+
+def chunked(html: str, size: int) -> list[bytes]:
+    data = html.encode()
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+CHUNK_SIZES = [1, 7, 13, 4096]
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_legacy_page(size):
+    info = extract_page_info(chunked(LEGACY_PAGE, size))
+    assert (info.edition, info.is_homebrew) == ("legacy", False)
+    assert info.title == "Fireball - Spells - D&D Beyond"
+    assert info.canonical_url == URL
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_homebrew_page(size):
+    info = extract_page_info(chunked(HOMEBREW_PAGE, size))
+    assert info.is_homebrew
+    assert info.edition == "2024"
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_2024_page(size):
+    # Other i-homebrew* class tokens (e.g. nav filters) don't mark homebrew
+    info = extract_page_info(chunked(PAGE_2024, size))
+    assert (info.edition, info.is_homebrew) == ("2024", False)
+    assert info.title == "Fireball - Spells - D&D Beyond"
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_page_without_title(size):
+    html = f"<html><head></head><body><p>{LEGACY_BANNER_TEXT}</p></body></html>"
+    info = extract_page_info(chunked(html, size))
+    assert info.title is None
+    assert info.canonical_url is None
+    assert info.is_legacy
+
+
+@pytest.mark.parametrize(
+    "markup",
+    [
+        f'<script>var banner = "{LEGACY_BANNER_TEXT}";</script>',
+        f'<div data-banner="{LEGACY_BANNER_TEXT}"></div>',
+        f"<!-- {LEGACY_BANNER_TEXT} -->",
+        "<p>This page doesn&#39;t reflect the latest rules and lore.</p>",
+    ],
+)
+def test_legacy_banner_anywhere_in_markup(markup):
+    info = extract_page_info(chunked(f"<html><body>{markup}</body></html>", 5))
+    assert info.is_legacy
+
+
+def test_banner_split_across_tags_does_not_match():
+    html = "<p>doesn't reflect the</p><p>latest rules and lore</p>"
+    assert not extract_page_info(chunked(html, 3)).is_legacy
+
+
+@pytest.mark.parametrize("size", [1, 3])
+def test_og_title_wins_and_charrefs_are_decoded(size):
+    html = (
+        "<html><head><title>Ignored - D&amp;D Beyond</title>"
+        '<meta property="og:title" content="Abi-Dalzim&#39;s Horrid Wilting">'
+        "</head><body></body></html>"
+    )
+    info = extract_page_info(chunked(html, size))
+    assert info.title == "Abi-Dalzim's Horrid Wilting"
+
+
+def test_multibyte_characters_split_across_chunks():
+    html = "<html><head><title>Abi-Dalzim’s Horrid Wilting</title></head></html>"
+    info = extract_page_info(chunked(html, 1))
+    assert info.title == "Abi-Dalzim’s Horrid Wilting"
+
+
+def guarded(chunks: list[bytes], stop_after: bytes) -> Iterator[bytes]:
+    """Yield chunks, failing if read past the chunk ending with `stop_after`."""
+    data = b""
+    for chunk in chunks:
+        yield chunk
+        data += chunk
+        if data.endswith(stop_after):
+            break
+    raise AssertionError("read past the point where the result was settled")
+
+
+def read_in_full(chunks: list[bytes]) -> bool:
+    consumed = []
+
+    def tracking() -> Iterator[bytes]:
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    extract_page_info(tracking())
+    return len(consumed) == len(chunks)
+
+
+def test_stops_reading_once_settled():
+    html = HOMEBREW_PAGE + "<p>" + "filler " * 1000 + "</p>"
+    # Settled once the homebrew marker's tag closes, well before the filler
+    settled = b'<span class="i-homebrew">'
+    info = extract_page_info(guarded(chunked(html, 1), settled))
+    assert info.is_homebrew
+
+
+@pytest.mark.parametrize("page", [PAGE_2024, LEGACY_PAGE])
+def test_pages_without_homebrew_marker_are_read_to_the_end(page):
+    assert read_in_full(chunked(page, 1))
+
+
+@pytest.mark.parametrize("size", [1, 13, 16384, 1 << 20])
+def test_homebrew_marker_after_legacy_banner(size):
+    html = LEGACY_PAGE.replace(
+        "</body>",
+        "<p>" + "filler " * 3000 + '</p><span class="i-homebrew"></span></body>',
+    )
+    info = extract_page_info(chunked(html, size))
+    assert info.is_legacy
+    assert info.is_homebrew
+
+
+@pytest.mark.parametrize(
+    ("title", "name"),
+    [
+        ("Fireball - Spells - D&D Beyond", "Fireball"),
+        (
+            "Abi-Dalzim's Horrid Wilting - Spells - D&D Beyond",
+            "Abi-Dalzim's Horrid Wilting",
+        ),
+        ("Sword - Blade of Ages - Magic Items - D&D Beyond", "Sword - Blade of Ages"),
+        ("Wizard - D&D Beyond", "Wizard"),
+        ("  Fireball \n - Spells - D&D Beyond ", "Fireball"),
+        ("Fireball - Spells", "Fireball - Spells"),
+        ("D&D Beyond", "D&D Beyond"),
+        ("   ", None),
+    ],
+)
+def test_name_from_title(title, name):
+    assert name_from_title(title) == name
+
+
+def test_page_name_uses_title_when_canonical_matches():
+    info = extract_page_info(chunked(LEGACY_PAGE, 64))
+    assert page_name(URL, info) == "Fireball"
+    assert page_name(URL.replace("https://", "http://"), info) == "Fireball"
+
+
+def test_page_name_rejects_mismatched_canonical():
+    html = HEAD.replace(URL, "https://www.dndbeyond.com/spells/2619-fire-bolt")
+    info = extract_page_info(chunked(html, 9))
+    assert page_name(URL, info) is None
+
+
+def test_page_name_ignores_canonical_query_and_trailing_slash():
+    html = HEAD.replace(URL, URL + "/?ref=x")
+    assert page_name(URL, extract_page_info(chunked(html, 9))) == "Fireball"
+
+
+def test_page_name_without_title():
+    info = extract_page_info(chunked(f'<link rel="canonical" href="{URL}">', 4))
+    assert page_name(URL, info) is None
@@ -0,0 +1,253 @@
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+from app.http import DEFAULT_TIMEOUT, RateLimiter, create_client
+from app.models import CommonCrawlStaging
+from scripts.scrape_commoncrawl import (
+    CDX_TIMEOUT,
+    CONTENT_PREFIXES,
+    canonical_content_url,
+    capture_is_current,
+    find_newest_captures,
+    get_cdx_num_pages,
+    main,
+    merge_captures,
+    prefix_for_url,
+    query_cdx,
+    stage_entries,
+    worker_pool,
+)
+
+PREFIX = "www.dndbeyond.com/spells/"
+URL = "https://www.dndbeyond.com/spells/2618-fireball"
+
+
+def capture(url: str = URL, timestamp: str = "20250101000000", **kwargs) -> dict:
+    record = {
+        "url": url,
+        "timestamp": timestamp,
+        "filename": f"crawl-data/{timestamp}.warc.gz",
+        "offset": "100",
+        "length": "2000",
+    }
+    return record | kwargs
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://www.dndbeyond.com/spells/2618-fireball",
+        "http://www.dndbeyond.com/spells/2618-fireball",
+        "www.dndbeyond.com/spells/2618-fireball",
+        "https://www.dndbeyond.com/spells/2618-fireball/",
+        "https://www.dndbeyond.com/spells/2618-fireball?utm_source=x",
+    ],
+)
+def test_canonical_content_url_normalises(url):
+    assert canonical_content_url(url, PREFIX) == URL
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        # Nested list/filter pages under the prefix
+        "https://www.dndbeyond.com/spells/class/8-wizard",
+        "https://www.dndbeyond.com/spells/school/evocation",
+        # The listing page itself and slugs without a numeric ID
+        "https://www.dndbeyond.com/spells/",
+        "https://www.dndbeyond.com/spells/fireball",
+        # A different prefix
+        "https://www.dndbeyond.com/monsters/16762-goblin",
+    ],
+)
+def test_canonical_content_url_rejects_non_content_pages(url):
+    assert canonical_content_url(url, PREFIX) is None
+
+
+@pytest.mark.parametrize("newest_first", [True, False])
+def test_merge_captures_keeps_newest_across_crawls(newest_first):
+    older = ("CC-MAIN-2024-10", [capture(timestamp="20240301000000")])
+    newer = ("CC-MAIN-2025-05", [capture(timestamp="20250201000000")])
+    seen: dict[str, dict] = {}
+    for crawl_id, records in [newer, older] if newest_first else [older, newer]:
+        merge_captures(seen, records, crawl_id, PREFIX, "Spell")
+
+    entry = seen[URL]
+    assert entry["_crawl_id"] == "CC-MAIN-2025-05"
+    assert entry["_timestamp"] == "20250201000000"
+    assert entry["_warc_filename"] == "crawl-data/20250201000000.warc.gz"
+    assert (entry["_warc_offset"], entry["_warc_length"]) == (100, 2000)
+
+
+def test_merge_captures_counts_only_new_urls():
+    seen: dict[str, dict] = {}
+    # One URL whose captures land on two different CDX pages of the same crawl
+    page_1 = [capture(timestamp="20250101000000")]
+    page_2 = [
+        capture("http://www.dndbeyond.com/spells/2618-fireball/", "20250102000000"),
+        capture("https://www.dndbeyond.com/spells/2619-fire-bolt"),
+    ]
+
+    assert merge_captures(seen, page_1, "CC-MAIN-2025-05", PREFIX, "Spell") == 1
+    assert merge_captures(seen, page_2, "CC-MAIN-2025-05", PREFIX, "Spell") == 1
+    assert sorted(seen) == [URL, "https://www.dndbeyond.com/spells/2619-fire-bolt"]
+    assert seen[URL]["_timestamp"] == "20250102000000"
+    assert seen[URL]["name"] == "Fireball"
+
+
+def test_merge_captures_keeps_category_from_first_sighting():
+    seen: dict[str, dict] = {}
+    merge_captures(seen, [capture(timestamp="20240101")], "CC-1", PREFIX, "Spell")
+    merge_captures(seen, [capture(timestamp="20250101")], "CC-2", PREFIX, "Other")
+
+    assert seen[URL]["category"] == "Spell"
+    assert seen[URL]["_crawl_id"] == "CC-2"
+
+
+def test_merge_captures_skips_rejected_urls():
+    seen: dict[str, dict] = {}
+    records = [capture("https://www.dndbeyond.com/spells/class/8-wizard"), capture()]
+    assert merge_captures(seen, records, "CC-MAIN-2025-05", PREFIX, "Spell") == 1
+    assert list(seen) == [URL]
+
+
+def test_only_cdx_queries_use_the_long_timeout():
+    timeouts: dict[str, dict] = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        key = "count" if "showNumPages" in request.url.params else request.url.path
+        timeouts[key] = request.extensions["timeout"]
+        return httpx.Response(200, json={"pages": 1})
+
+    with create_client(transport=httpx.MockTransport(handler)) as client:
+        get_cdx_num_pages("CC-MAIN-2025-05", PREFIX, client)
+        query_cdx("CC-MAIN-2025-05", PREFIX, None, client)
+        client.get("https://data.commoncrawl.org/warc")
+
+    assert timeouts["count"] == CDX_TIMEOUT.as_dict()
+    assert timeouts["/CC-MAIN-2025-05-index"] == CDX_TIMEOUT.as_dict()
+    assert timeouts["/warc"] == DEFAULT_TIMEOUT.as_dict()
+
+
+def test_dry_run_cannot_resume(capsys):
+    with pytest.raises(SystemExit):
+        main(["--dry-run", "--resume"])
+    assert "--dry-run keeps no checkpoint journal" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    ("timestamp", "lastmod", "current"),
+    [
+        # Missing or unparseable lastmod can't show the capture is stale
+        ("20250101000000", None, True),
+        ("20250101000000", "", True),
+        ("20250101000000", "not a date", True),
+        # Date-only lastmod is the start of that (UTC) day
+        ("20250102000000", "2025-01-02", True),
+        ("20250101235959", "2025-01-02", False),
+        # Timezones are converted to UTC before comparing
+        ("20250102080000", "2025-01-02T10:00:00+02:00", True),
+        ("20250102075959", "2025-01-02T10:00:00+02:00", False),
+        ("20250102100000", "2025-01-02T10:00:00Z", True),
+        ("20250102100000", "2025-01-02T10:00Z", True),
+        # Fractional seconds round up: the same second isn't late enough
+        ("20250102100000", "2025-01-02T10:00:00.250Z", False),
+        ("20250102100001", "2025-01-02T10:00:00.250Z", True),
+    ],
+)
+def test_capture_is_current(timestamp, lastmod, current):
+    assert capture_is_current(timestamp, lastmod) is current
+
+
+def test_prefix_for_url():
+    assert prefix_for_url(URL, CONTENT_PREFIXES) == (PREFIX, "Spell")
+    assert (
+        prefix_for_url("https://www.dndbeyond.com/forums/1-x", CONTENT_PREFIXES) is None
+    )
+
+
+def test_find_newest_captures_stops_at_first_crawl_with_a_capture():
+    queried: list[tuple[str, str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        crawl_id = request.url.path.strip("/").removesuffix("-index")
+        queried.append((crawl_id, request.url.params["url"]))
+        if crawl_id == "CC-2":
+            return httpx.Response(200, text=json.dumps(capture()))
+        return httpx.Response(200, text="")
+
+    limiter = RateLimiter(0)
+    with create_client(transport=httpx.MockTransport(handler)) as client:
+        found = find_newest_captures(URL, ["CC-3", "CC-2", "CC-1"], client, limiter)
+        missing = find_newest_captures(URL + "-x", ["CC-1"], client, limiter)
+
+    assert found == ("CC-2", [capture()])
+    assert missing is None
+    # Exact-URL queries, newest crawl first, and nothing older than the hit
+    bare = URL.removeprefix("https://")
+    assert queried == [("CC-3", bare), ("CC-2", bare), ("CC-1", bare + "-x")]
+
+
+def test_worker_pool_cancels_queued_tasks_on_interrupt():
+    started = threading.Event()
+    ran: list[int] = []
+
+    def fetch(i: int) -> None:
+        started.set()
+        ran.append(i)
+        time.sleep(0.05)
+
+    with pytest.raises(KeyboardInterrupt):
+        with worker_pool(1) as pool:
+            futures = [pool.submit(fetch, i) for i in range(30)]
+            started.wait()
+            raise KeyboardInterrupt
+
+    # Only the fetch already running finished; the queued ones never started
+    assert futures[-1].cancelled()
+    assert len(ran) < len(futures)
+
+
+def staged_row(**kwargs) -> dict:
+    values = {
+        "url": URL,
+        "name": "Fireball",
+        "title_name": None,
+        "category": "Spell",
+        "edition": None,
+        "crawl_id": "CC-1",
+        "capture_timestamp": "20250101000000",
+    }
+    return values | kwargs
+
+
+def staged_capture(db) -> tuple:
+    row = db.get(CommonCrawlStaging, URL)
+    db.refresh(row)
+    return (row.edition, row.title_name, row.crawl_id, row.capture_timestamp)
+
+
+def test_unclassified_capture_keeps_the_classified_one(db):
+    stage_entries([staged_row(edition="legacy", title_name="Fireball")], db)
+    # e.g. a --skip-warc run, or a failed WARC fetch, of a newer capture
+    stage_entries([staged_row(crawl_id="CC-2", capture_timestamp="20250301")], db)
+    assert staged_capture(db) == ("legacy", "Fireball", "CC-1", "20250101000000")
+
+
+def test_classified_capture_replaces_the_previous_one(db):
+    stage_entries([staged_row(edition="legacy", title_name="Fireball")], db)
+    stage_entries(
+        [staged_row(edition="2024", crawl_id="CC-2", capture_timestamp="20250301")],
+        db,
+    )
+    assert staged_capture(db) == ("2024", None, "CC-2", "20250301")
+
+
+def test_unclassified_captures_move_forward(db):
+    stage_entries([staged_row()], db)
+    stage_entries([staged_row(crawl_id="CC-2", capture_timestamp="20250301")], db)
+    assert staged_capture(db) == (None, None, "CC-2", "20250301")
@@ -0,0 +1,37 @@
+import pytest
+
+from scripts.scrape_sitemap import classify_change
+
+URL = "https://www.dndbeyond.com/spells/2618-fireball"
+
+
+@pytest.mark.parametrize(
+    ("lastmod", "stored", "change"),
+    [
+        # Same value, or no <lastmod> to compare
+        ("2025-01-02", "2025-01-02", None),
+        (None, "2025-01-02", None),
+        (None, None, None),
+        # A <lastmod> where there was none, or a later one
+        ("2025-01-02", None, "modified"),
+        ("2025-01-03", "2025-01-02", "modified"),
+        ("2025-01-02T10:00:01Z", "2025-01-02T10:00:00Z", "modified"),
+        # Same instant written differently
+        ("2025-01-02T10:00:00Z", "2025-01-02T10:00:00+00:00", None),
+        ("2025-01-02T12:00:00+02:00", "2025-01-02T10:00:00Z", None),
+        ("2025-01-02T00:00:00Z", "2025-01-02", None),
+        # Fractional seconds are a change within the second
+        ("2025-01-02T10:00:00.500Z", "2025-01-02T10:00:00Z", "modified"),
+        ("2025-01-02T10:00:00.500Z", "2025-01-02T10:00:00.900Z", None),
+        # Unparseable values only match themselves
+        ("yesterday", "yesterday", None),
+        ("yesterday", "today", "modified"),
+    ],
+)
+def test_classify_change(lastmod, stored, change):
+    assert classify_change(URL, lastmod, {URL: stored}) == change
+
+
+def test_classify_change_new_url():
+    assert classify_change(URL, "2025-01-02", {}) == "new"
+    assert classify_change(URL, None, {}) == "new"
@@ -0,0 +1,68 @@
+import threading
+import time
+
+import pytest
+
+from app.writer import BackgroundWriter
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+        self.closed = False
+
+    def commit(self):
+        self.commits += 1
+
+    def close(self):
+        self.closed = True
+
+
+def make_writer(write_batch, session: FakeSession, **kwargs) -> BackgroundWriter:
+    return BackgroundWriter(write_batch, session_factory=lambda: session, **kwargs)
+
+
+def test_batches_by_size_and_flushes_remainder_on_close():
+    batches: list[list[dict]] = []
+    session = FakeSession()
+
+    def write_batch(rows, db):
+        batches.append(rows)
+        return len(rows)
+
+    with make_writer(write_batch, session, batch_size=2, flush_interval=60) as writer:
+        for i in range(5):
+            writer.put({"i": i})
+
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert writer.rows_written == 5
+    assert writer.rows_affected == 5
+    assert session.commits == 3
+    assert session.closed
+
+
+def test_flushes_partial_batch_after_interval():
+    flushed = threading.Event()
+
+    def write_batch(rows, db):
+        flushed.set()
+        return len(rows)
+
+    with make_writer(
+        write_batch, FakeSession(), batch_size=100, flush_interval=0.05
+    ) as writer:
+        writer.put({"i": 0})
+        assert flushed.wait(timeout=2)
+        assert writer.rows_written == 1
+
+
+def test_write_error_surfaces_to_producer():
+    def write_batch(rows, db):
+        raise ValueError("boom")
+
+    writer = make_writer(write_batch, FakeSession(), batch_size=1, max_pending=1)
+    with pytest.raises(RuntimeError, match="writer failed"):
+        with writer:
+            deadline = time.monotonic() + 2
+            while time.monotonic() < deadline:
+                writer.put({"i": 0})
@@ -1,4 +1,4 @@
-import type { Entry } from '../types'
+import type { Entry, TypoIndex } from '../types'
 
 export async function fetchEntries(): Promise<Entry[]> {
   const response = await fetch('/entries.json')
@@ -10,3 +10,14 @@ export async function fetchEntries(): Promise<Entry[]> {
   }
   return response.json() as Promise<Entry[]>
 }
+
+// The typo dictionary only enables fuzzy matching, so a missing or broken one
+// degrades search instead of failing the page
+export async function fetchTypoIndex(): Promise<TypoIndex | null> {
+  try {
+    const response = await fetch('/typos.json')
+    return response.ok ? ((await response.json()) as TypoIndex) : null
+  } catch {
+    return null
+  }
+}
@@ -1,16 +1,18 @@
 import { useEffect, useState } from 'react'
-import { fetchEntries } from '../api/entries'
-import type { IndexedEntry } from '../types'
+import { fetchEntries, fetchTypoIndex } from '../api/entries'
+import type { IndexedEntry, TypoIndex } from '../types'
 import { indexEntries } from '../search/search'
 
 interface UseEntriesResult {
   entries: IndexedEntry[]
+  typos: TypoIndex | null
   loading: boolean
   error: string | null
 }
 
 export function useEntries(): UseEntriesResult {
   const [entries, setEntries] = useState<IndexedEntry[]>([])
+  const [typos, setTypos] = useState<TypoIndex | null>(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
 
@@ -31,10 +33,15 @@ export function useEntries(): UseEntriesResult {
         }
       })
 
+    // Loaded alongside entries but never blocks them; search works without it
+    fetchTypoIndex().then(index => {
+      if (!cancelled) setTypos(index)
+    })
+
     return () => {
       cancelled = true
     }
   }, [])
 
-  return { entries, loading, error }
+  return { entries, typos, loading, error }
 }
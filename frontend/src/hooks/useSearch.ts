@@ -1,5 +1,5 @@
 import { useState } from 'react'
-import type { IndexedEntry } from '../types'
+import type { IndexedEntry, TypoIndex } from '../types'
 import { search } from '../search/search'
 
 const SHOW_LEGACY_KEY = 'rpgelsewhere.showLegacy'
@@ -21,7 +21,7 @@ interface UseSearchResult {
   setShowLegacy: (v: boolean) => void
 }
 
-export function useSearch(entries: IndexedEntry[]): UseSearchResult {
+export function useSearch(entries: IndexedEntry[], typos: TypoIndex | null = null): UseSearchResult {
   const [query, setQuery] = useState('')
   const [showLegacy, setShowLegacyState] = useState(loadShowLegacy)
 
@@ -34,7 +34,7 @@ export function useSearch(entries: IndexedEntry[]): UseSearchResult {
     setShowLegacyState(v)
   }
 
-  const results = search(query, entries, showLegacy)
+  const results = search(query, entries, showLegacy, typos)
 
   return { query, setQuery, results, showLegacy, setShowLegacy }
 }
@@ -5,8 +5,8 @@ import { useEntries } from '../hooks/useEntries'
 import { useSearch } from '../hooks/useSearch'
 
 export function SearchPage() {
-  const { entries, loading, error } = useEntries()
-  const { query, setQuery, results, showLegacy, setShowLegacy } = useSearch(entries)
+  const { entries, typos, loading, error } = useEntries()
+  const { query, setQuery, results, showLegacy, setShowLegacy } = useSearch(entries, typos)
   const [aboutOpen, setAboutOpen] = useState(false)
 
   return (
@@ -24,6 +24,15 @@ export function scoreSubstringMatch(query: string, entry: IndexedEntry): number
   return entry.nameLower.includes(query) ? 15 : 0
 }
 
+// Typo-tolerant fallback: every query word starts a name word, either as typed
+// or as one of its dictionary corrections (see expandQuery in ./typos)
+export function scoreFuzzyMatch(alternatives: string[][], entry: IndexedEntry): number {
+  const allMatch = alternatives.every(alts =>
+    alts.some(alt => entry.nameWords.some(word => word.startsWith(alt))),
+  )
+  return allMatch ? 10 : 0
+}
+
 const CATEGORY_BOOSTS: Record<string, number> = {
   class: 10,
   spell: 5,
@@ -49,14 +58,15 @@ export function scoreEdition(_query: string, entry: IndexedEntry): number {
   return entry.edition === 'legacy' ? 0 : 2
 }
 
-export function scoreEntry(query: string, entry: IndexedEntry): number {
-  const matchScore =
+export function scoreEntry(query: string, entry: IndexedEntry, alternatives: string[][] | null = null): number {
+  let matchScore =
     scoreExactMatch(query, entry) +
     scorePrefixMatch(query, entry) +
     scoreMultiWordMatch(query, entry) +
     scoreWordStartMatch(query, entry) +
     scoreSubstringMatch(query, entry)
 
+  if (matchScore === 0 && alternatives) matchScore = scoreFuzzyMatch(alternatives, entry)
   if (matchScore === 0) return 0
 
   return matchScore + scoreCategoryBoost(query, entry) + scoreNameLength(query, entry) + scoreEdition(query, entry)
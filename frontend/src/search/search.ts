@@ -1,5 +1,6 @@
-import type { Entry, IndexedEntry } from '../types'
+import type { Entry, IndexedEntry, TypoIndex } from '../types'
 import { scoreEntry } from './scoring'
+import { expandQuery } from './typos'
 
 const TOP_N = 20
 
@@ -12,16 +13,24 @@ export function indexEntries(entries: Entry[]): IndexedEntry[] {
   }))
 }
 
-export function search(query: string, entries: IndexedEntry[], showLegacy = true): IndexedEntry[] {
+export function search(
+  query: string,
+  entries: IndexedEntry[],
+  showLegacy = true,
+  typos: TypoIndex | null = null,
+): IndexedEntry[] {
   const q = query.trim().toLowerCase()
   if (!q) return []
 
+  // Corrections are looked up once per query, not per entry
+  const alternatives = typos ? expandQuery(q, typos) : null
+
   const pool = showLegacy ? entries : entries.filter(e => e.edition !== 'legacy')
 
   const scored: Array<{ entry: IndexedEntry; score: number }> = []
 
   for (const entry of pool) {
-    const score = scoreEntry(q, entry)
+    const score = scoreEntry(q, entry, alternatives)
     if (score > 0) {
       scored.push({ entry, score })
     }
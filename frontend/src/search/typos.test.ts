@@ -0,0 +1,107 @@
+import { describe, expect, it } from 'vitest'
+import type { IndexedEntry, TypoIndex } from '../types'
+import { scoreFuzzyMatch } from './scoring'
+import { indexEntries, search } from './search'
+import { corrections, deletes, editDistance, expandQuery } from './typos'
+
+// Mirrors build_typo_index() in backend/scripts/export_entries.py
+function buildIndex(names: string[]): TypoIndex {
+  const index: TypoIndex = { minLength: 4, longLength: 8, maxDistance: 2, prefixLength: 7, words: [], deletes: {} }
+  const tokens = new Set(names.flatMap(n => n.toLowerCase().split(/\s+/)).filter(t => t.length >= index.minLength))
+  index.words = [...tokens].sort()
+  index.words.forEach((word, i) => {
+    const distance = word.length >= index.longLength ? index.maxDistance : 1
+    for (const variant of deletes(word.slice(0, index.prefixLength), distance)) {
+      index.deletes[variant] ??= []
+      index.deletes[variant].push(i)
+    }
+  })
+  return index
+}
+
+const NAMES = ['Fireball', 'Fire Bolt', 'Magic Missile', 'Wizard', 'Misty Step']
+const INDEX = buildIndex(NAMES)
+
+function makeEntry(name: string): IndexedEntry {
+  return indexEntries([{ name, category: 'Spell', url: `https://example.com/${name}`, edition: null }])[0]
+}
+
+describe('deletes', () => {
+  it('includes the word and every single deletion', () => {
+    expect(deletes('abc', 1)).toEqual(new Set(['abc', 'ab', 'ac', 'bc']))
+  })
+
+  it('never produces the empty string', () => {
+    expect(deletes('ab', 2)).toEqual(new Set(['ab', 'a', 'b']))
+  })
+})
+
+describe('editDistance', () => {
+  it('counts insertions, deletions and substitutions', () => {
+    expect(editDistance('misile', 'missile')).toBe(1)
+    expect(editDistance('wizerd', 'wizard')).toBe(1)
+    expect(editDistance('firbal', 'fireball')).toBe(2)
+  })
+
+  it('counts an adjacent transposition as one edit', () => {
+    expect(editDistance('wizrad', 'wizard')).toBe(1)
+  })
+})
+
+describe('corrections', () => {
+  it('finds words within one edit for short words', () => {
+    expect(corrections('misile', INDEX)).toEqual(['missile'])
+    expect(corrections('wizrad', INDEX)).toEqual(['wizard'])
+  })
+
+  it('finds words within two edits for long words', () => {
+    expect(corrections('firbal', INDEX)).toContain('fireball')
+  })
+
+  it('rejects candidates beyond the allowed distance', () => {
+    expect(corrections('wzrdd', INDEX)).toEqual([])
+  })
+
+  it('ignores known words and words below the minimum length', () => {
+    expect(corrections('wizard', INDEX)).toEqual([])
+    expect(corrections('mgc', INDEX)).toEqual([])
+  })
+})
+
+describe('expandQuery', () => {
+  it('keeps each typed word alongside its corrections', () => {
+    expect(expandQuery('magic misile', INDEX)).toEqual([['magic'], ['misile', 'missile']])
+  })
+
+  it('returns null when nothing needs correcting', () => {
+    expect(expandQuery('magic missile', INDEX)).toBeNull()
+  })
+})
+
+describe('scoreFuzzyMatch', () => {
+  it('returns 10 when every word starts a name word', () => {
+    expect(scoreFuzzyMatch([['magic'], ['misile', 'missile']], makeEntry('Magic Missile'))).toBe(10)
+  })
+
+  it('returns 0 when any word is unmatched', () => {
+    expect(scoreFuzzyMatch([['magic'], ['misile', 'missile']], makeEntry('Misty Step'))).toBe(0)
+  })
+})
+
+describe('search with a typo dictionary', () => {
+  const entries = indexEntries(NAMES.map(name => ({ name, category: 'Spell', url: `https://example.com/${name}`, edition: null })))
+
+  it('matches misspelled queries', () => {
+    expect(search('magic misile', entries, true, INDEX).map(e => e.name)).toEqual(['Magic Missile'])
+    expect(search('wizrad', entries, true, INDEX).map(e => e.name)).toEqual(['Wizard'])
+  })
+
+  it('ranks exact matches above fuzzy ones', () => {
+    const results = search('fire', entries, true, INDEX).map(e => e.name)
+    expect(results.slice(0, 2).sort()).toEqual(['Fire Bolt', 'Fireball'])
+  })
+
+  it('finds nothing for typos without a dictionary', () => {
+    expect(search('magic misile', entries)).toEqual([])
+  })
+})
@@ -0,0 +1,93 @@
+import type { TypoIndex } from '../types'
+
+// Edit distance a word of this length tolerates; must match typo_distance()
+// in scripts/export_entries.py, which built the dictionary
+export function typoDistance(word: string, index: TypoIndex): number {
+  if (word.length < index.minLength) return 0
+  return word.length >= index.longLength ? index.maxDistance : 1
+}
+
+// word plus every non-empty string reachable by <= distance deletions
+export function deletes(word: string, distance: number): Set<string> {
+  const results = new Set([word])
+  let frontier = [word]
+  for (let d = 0; d < distance; d++) {
+    const next: string[] = []
+    for (const w of frontier) {
+      for (let i = 0; i < w.length; i++) {
+        const variant = w.slice(0, i) + w.slice(i + 1)
+        if (variant && !results.has(variant)) {
+          results.add(variant)
+          next.push(variant)
+        }
+      }
+    }
+    frontier = next
+  }
+  return results
+}
+
+// Optimal string alignment distance (adjacent transpositions count as one edit)
+export function editDistance(a: string, b: string): number {
+  let prevPrev: number[] = []
+  let prev = Array.from({ length: b.length + 1 }, (_, j) => j)
+  for (let i = 1; i <= a.length; i++) {
+    const row = [i]
+    for (let j = 1; j <= b.length; j++) {
+      const cost = a[i - 1] === b[j - 1] ? 0 : 1
+      row[j] = Math.min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + cost)
+      if (i > 1 && j > 1 && a[i - 1] === b[j - 2] && a[i - 2] === b[j - 1]) {
+        row[j] = Math.min(row[j], prevPrev[j - 2] + 1)
+      }
+    }
+    prevPrev = prev
+    prev = row
+  }
+  return prev[b.length]
+}
+
+function isKnownWord(word: string, words: string[]): boolean {
+  let lo = 0
+  let hi = words.length - 1
+  while (lo <= hi) {
+    const mid = (lo + hi) >> 1
+    if (words[mid] === word) return true
+    if (words[mid] < word) lo = mid + 1
+    else hi = mid - 1
+  }
+  return false
+}
+
+// Dictionary words within typo distance of a word that isn't itself in the
+// dictionary. Candidates come from hash lookups of the word's deletes; only
+// those are checked with a real edit distance.
+export function corrections(word: string, index: TypoIndex): string[] {
+  if (word.length < index.minLength || isKnownWord(word, index.words)) return []
+
+  const candidates = new Set<number>()
+  for (const variant of deletes(word.slice(0, index.prefixLength), index.maxDistance)) {
+    for (const i of index.deletes[variant] ?? []) candidates.add(i)
+  }
+
+  const results: string[] = []
+  for (const i of candidates) {
+    const candidate = index.words[i]
+    if (editDistance(word, candidate) <= typoDistance(candidate, index)) {
+      results.push(candidate)
+    }
+  }
+  return results
+}
+
+// For each query word, the spellings to accept: as typed plus any corrections.
+// Returns null when no word has a correction, so callers can skip fuzzy scoring.
+export function expandQuery(query: string, index: TypoIndex): string[][] | null {
+  const words = query.split(' ').filter(Boolean)
+  let corrected = false
+  const alternatives = words.map(word => {
+    const fixes = corrections(word, index)
+    if (fixes.length > 0) corrected = true
+    return [word, ...fixes]
+  })
+  return corrected ? alternatives : null
+}
@@ -10,3 +10,13 @@ export interface IndexedEntry extends Entry {
   categoryLower: string
   nameWords: string[]
 }
+
+// Symmetric-delete typo dictionary written by scripts.export_entries
+export interface TypoIndex {
+  minLength: number
+  longLength: number
+  maxDistance: number
+  prefixLength: number
+  words: string[]
+  deletes: Record<string, number[]>
+}